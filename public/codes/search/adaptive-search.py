@@ -0,0 +1,281 @@
+# 適応的探索 (Adaptive Search)
+# ソート済み配列に対する探索方法を、キーの分布に合わせて選ぶ
+#
+# - 補間探索: 値が一様に分布していれば、値から位置を見積もって O(log log n) 回で見つける
+# - 指数探索: 1, 2, 4, 8, ... と範囲を広げてから二分探索する。長さの分からない列にも使える
+# - ギャロッピング探索: 前回の位置（ヒント）から指数探索する。昇順の問い合わせが続くときに速い
+#
+# どの関数も (インデックス, 調べた要素の数) を返すので、方法ごとの比較回数を比べられる
+
+import math
+import random
+
+SAMPLE_SIZE = 64  # 分布を調べるときに見る要素の数
+UNIFORM_TOLERANCE = 0.01  # 位置の見積もりの平均誤差がこの割合以下なら一様とみなす
+
+
+def binary_search_probes(array, target, lo=0, hi=None):
+    """
+    二分探索（比較回数つき）
+
+    Args:
+        array (list): ソート済みの探索対象配列
+        target: 探している値
+        lo (int): 探索範囲の左端
+        hi (int): 探索範囲の右端（この位置は含まない）
+
+    Returns:
+        tuple: (見つかった場合はインデックス、見つからない場合は -1, 調べた要素の数)
+    """
+    if hi is None:
+        hi = len(array)
+    probes = 0
+    # target 以上の最初の位置を求めてから、一致するかを確かめる
+    while lo < hi:
+        mid = (lo + hi) // 2
+        probes += 1
+        if array[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo < len(array):
+        probes += 1
+        if array[lo] == target:
+            return lo, probes
+    return -1, probes
+
+
+def interpolation_search(array, target):
+    """
+    補間探索（数値の配列用）
+
+    値が一様に分布していれば O(log log n) 回で見つかる。
+    見積もりが外れ続けた場合は二分探索に切り替えるので、最悪でも O(log n) 回に収まる
+
+    Returns:
+        tuple: (見つかった場合はインデックス、見つからない場合は -1, 調べた要素の数)
+    """
+    n = len(array)
+    if n == 0:
+        return -1, 0
+    low_value = array[0]
+    if not low_value < target:
+        return (0, 1) if low_value == target else (-1, 1)
+    high_value = array[n - 1]
+    if high_value < target:
+        return -1, 2
+
+    # array[lo] < target <= array[hi] を保ちながら範囲を狭める（両端の値は読み済み）
+    lo = 0
+    hi = n - 1
+    probes = 2
+    limit = 2 * n.bit_length()  # これを超えたら二分探索に切り替える
+    while hi - lo > 1:
+        if probes < limit:
+            # 値の比率から位置を見積もる
+            pos = lo + math.ceil((target - low_value) * (hi - lo) / (high_value - low_value))
+            pos = min(max(pos, lo + 1), hi - 1)
+        else:
+            pos = (lo + hi) // 2
+        value = array[pos]
+        probes += 1
+        if value < target:
+            lo, low_value = pos, value
+        else:
+            hi, high_value = pos, value
+    return (hi, probes) if high_value == target else (-1, probes)
+
+
+def exponential_search(sequence, target):
+    """
+    指数探索
+
+    len() を使わないので、末尾を越えると IndexError を出す列（長さの分からない列）にも使える
+
+    Args:
+        sequence: 添字で読めるソート済みの列
+        target: 探している値
+
+    Returns:
+        tuple: (見つかった場合はインデックス、見つからない場合は -1, 調べた要素の数)
+    """
+    probes = 0
+    bound = 1
+    # target 以上の値か列の終わりが見つかるまで範囲を倍にする
+    while True:
+        try:
+            value = sequence[bound - 1]
+        except IndexError:
+            break
+        probes += 1
+        if not value < target:
+            break
+        bound *= 2
+
+    lo = bound // 2
+    hi = bound
+    # 範囲の中で target 以上の最初の位置を探す（範囲が列の外にはみ出していても構わない）
+    while lo < hi:
+        mid = (lo + hi) // 2
+        try:
+            value = sequence[mid]
+        except IndexError:
+            hi = mid
+            continue
+        probes += 1
+        if value < target:
+            lo = mid + 1
+        else:
+            hi = mid
+
+    try:
+        value = sequence[lo]
+    except IndexError:
+        return -1, probes
+    probes += 1
+    return (lo, probes) if value == target else (-1, probes)
+
+
+def galloping_search(array, target, hint=0):
+    """
+    ギャロッピング探索: hint の位置から左右どちらかへ 1, 2, 4, ... と跳んで範囲を決め、二分探索する
+
+    答えが hint から d だけ離れていれば O(log d) 回で済む
+
+    Returns:
+        tuple: (見つかった場合はインデックス、見つからない場合は -1, 調べた要素の数)
+    """
+    n = len(array)
+    if n == 0:
+        return -1, 0
+    hint = min(max(hint, 0), n - 1)
+    probes = 1
+    step = 1
+    if array[hint] < target:
+        # 右へ: array[lo] < target <= array[hi] となる範囲を探す
+        lo = hint
+        hi = hint + step
+        while hi < n:
+            probes += 1
+            if not array[hi] < target:
+                break
+            lo = hi
+            step *= 2
+            hi = hint + step
+        hi = min(hi, n)
+        lo += 1
+    else:
+        # 左へ: array[lo] < target <= array[hi] となる範囲を探す
+        hi = hint
+        lo = hint - step
+        while lo >= 0:
+            probes += 1
+            if array[lo] < target:
+                break
+            hi = lo
+            step *= 2
+            lo = hint - step
+        lo = max(lo + 1, 0)
+
+    index, more = binary_search_probes(array, target, lo, hi)
+    return index, probes + more
+
+
+class AdaptiveSearcher:
+    """
+    配列ごとに一度だけ分布を調べ、補間探索と二分探索のどちらで探すかを決める
+
+    指数探索とギャロッピング探索は分布からは選ばない。
+    昇順に続く問い合わせでは、search(target, sequential=True) で前回の位置からギャロッピング探索する
+    """
+
+    def __init__(self, array, sample_size=SAMPLE_SIZE, seed=0):
+        """
+        Args:
+            array (list): ソート済みの探索対象配列
+            sample_size (int): 分布を調べるときに見る要素の数
+            seed (int): 見る要素を選ぶ乱数の種
+        """
+        self.array = array
+        self.method = self.choose_method(array, sample_size, random.Random(seed))
+        self.last = 0  # 前回見つけた位置（ギャロッピング探索のヒント）
+        self.queries = 0
+        self.total_probes = 0
+
+    @staticmethod
+    def choose_method(array, sample_size, rng):
+        """
+        分布を調べて探索方法を選ぶ（調べる要素がなければ二分探索）
+
+        Returns:
+            str: "interpolation" または "binary"
+        """
+        n = len(array)
+        if n < 16 or sample_size < 1:
+            return "binary"
+        first = array[0]
+        last = array[-1]
+        if not all(isinstance(v, (int, float)) for v in (first, last)) or first == last:
+            return "binary"
+
+        # 値から見積もった位置と実際の位置のずれを、いくつかの要素で測る
+        error = 0.0
+        indices = [rng.randrange(n) for _ in range(sample_size)]
+        if not indices:
+            return "binary"
+        for i in indices:
+            value = array[i]
+            if not isinstance(value, (int, float)):
+                return "binary"
+            estimate = (value - first) / (last - first) * (n - 1)
+            error += abs(estimate - i) / n
+        if error / len(indices) <= UNIFORM_TOLERANCE:
+            return "interpolation"
+        return "binary"
+
+    def search(self, target, sequential=False):
+        """
+        target を探す
+
+        Args:
+            target: 探している値
+            sequential (bool): 問い合わせが昇順に続いている場合は True（前回の位置から探す）
+
+        Returns:
+            tuple: (見つかった場合はインデックス、見つからない場合は -1, 調べた要素の数)
+        """
+        if sequential:
+            index, probes = galloping_search(self.array, target, self.last)
+        elif self.method == "interpolation":
+            index, probes = interpolation_search(self.array, target)
+        else:
+            index, probes = binary_search_probes(self.array, target)
+        if index >= 0:
+            self.last = index
+        self.queries += 1
+        self.total_probes += probes
+        return index, probes
+
+    def stats(self):
+        """選んだ方法と、問い合わせあたりの平均の比較回数"""
+        return {
+            "method": self.method,
+            "queries": self.queries,
+            "average_probes": self.total_probes / self.queries if self.queries else 0.0,
+        }
+
+
+# 使用例
+if __name__ == "__main__":
+    n = 1_000_000
+    rng = random.Random(1)
+    uniform = sorted(rng.randrange(n * 10) for _ in range(n))
+    skewed = sorted(int(math.exp(rng.random() * 20)) for _ in range(n))
+
+    for name, array in (("一様な分布", uniform), ("偏った分布", skewed)):
+        searcher = AdaptiveSearcher(array)
+        for _ in range(1000):
+            searcher.search(array[rng.randrange(n)])
+        stats = searcher.stats()
+        print(f"{name}: 方法 = {stats['method']}, 平均の比較回数 = {stats['average_probes']:.1f}"
+              f" (二分探索なら約 {math.log2(n):.0f} 回)")
@@ -1,6 +1,12 @@
 # 二分探索 (Binary Search)
 # ソート済み配列を半分に分けながら効率的に探索するアルゴリズム
 
+from bisect import bisect_left, bisect_right
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 def binary_search(array, target):
     """
@@ -93,3 +99,141 @@ def binary_search_detailed(array, target):
 if __name__ == "__main__":
     print("\n" + "=" * 50)
     binary_search_detailed([2, 5, 8, 12, 16, 23, 38, 45, 67, 78], 23)
+
+
+def lower_bound(array, target, lo=0, hi=None):
+    """
+    target 以上の値が最初に現れる位置を求める
+
+    Args:
+        array (list): ソート済みの探索対象配列
+        target: 探している値
+        lo (int): 探索範囲の左端
+        hi (int): 探索範囲の右端（この位置は含まない）
+
+    Returns:
+        int: target を挿入しても順序が崩れない最も左の位置
+    """
+    if hi is None:
+        hi = len(array)
+
+    # array[lo - 1] < target <= array[hi] を保ちながら範囲を狭める
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if array[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def upper_bound(array, target, lo=0, hi=None):
+    """
+    target より大きい値が最初に現れる位置を求める
+
+    Args:
+        array (list): ソート済みの探索対象配列
+        target: 探している値
+        lo (int): 探索範囲の左端
+        hi (int): 探索範囲の右端（この位置は含まない）
+
+    Returns:
+        int: target を挿入しても順序が崩れない最も右の位置
+    """
+    if hi is None:
+        hi = len(array)
+
+    # array[lo - 1] <= target < array[hi] を保ちながら範囲を狭める
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if target < array[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def is_sorted(values):
+    """値が昇順に並んでいるかどうか"""
+    return all(values[i] <= values[i + 1] for i in range(len(values) - 1))
+
+
+def batch_search(array, targets, side="left"):
+    """
+    多数の値の位置を一度に求める（lower_bound / upper_bound のバッチ版）
+
+    NumPy があれば searchsorted で全体をまとめて計算する。
+    ない場合、targets が昇順なら前の答えの位置から次の探索を始める（マージ歩き）。
+    どちらでもなければ C 実装の bisect を使う。
+    いずれの場合も、1回ごとの Python の関数呼び出しとループのコストをバッチ全体で分け合う
+
+    Args:
+        array (list): ソート済みの探索対象配列（NumPy 配列でもよい）
+        targets (list): 探す値の並び
+        side (str): "left" なら lower_bound、"right" なら upper_bound と同じ位置を返す
+
+    Returns:
+        list: targets と同じ順の位置のリスト（NumPy 配列を渡した場合は NumPy 配列）
+    """
+    if side not in ("left", "right"):
+        raise ValueError(f"side must be 'left' or 'right': {side}")
+
+    if np is not None and (isinstance(array, np.ndarray) or isinstance(targets, np.ndarray)):
+        result = np.searchsorted(np.asarray(array), np.asarray(targets), side=side)
+        return result if isinstance(array, np.ndarray) else result.tolist()
+
+    search = bisect_left if side == "left" else bisect_right
+    if not isinstance(targets, (list, tuple)):
+        targets = list(targets)
+
+    if is_sorted(targets):
+        # 昇順の targets は答えも昇順なので、前の答えより左を調べる必要はない
+        result = []
+        lo = 0
+        for target in targets:
+            lo = search(array, target, lo)
+            result.append(lo)
+        return result
+
+    return [search(array, target) for target in targets]
+
+
+def batch_binary_search(array, targets):
+    """
+    多数の値を一度に探す（binary_search のバッチ版）
+
+    Args:
+        array (list): ソート済みの探索対象配列
+        targets (list): 探す値の並び
+
+    Returns:
+        list: 値ごとの最初に見つかったインデックス、見つからない場合は -1
+              （NumPy 配列を渡した場合は NumPy 配列）
+    """
+    if not isinstance(targets, (list, tuple)) and not (np is not None and isinstance(targets, np.ndarray)):
+        # ジェネレータは一度しか読めないので、探索と答え合わせで同じ並びを使えるようにリストにしておく
+        targets = list(targets)
+
+    if np is not None and isinstance(array, np.ndarray):
+        targets = np.asarray(targets)
+        positions = np.searchsorted(array, targets, side="left")
+        if len(array) == 0:
+            return np.full(len(targets), -1)
+        found = (positions < len(array)) & (array[np.minimum(positions, len(array) - 1)] == targets)
+        return np.where(found, positions, -1)
+
+    positions = batch_search(array, targets, "left")
+    n = len(array)
+    return [i if i < n and array[i] == target else -1 for i, target in zip(positions, targets)]
+
+
+# バッチ探索の実行例
+if __name__ == "__main__":
+    print("\n" + "=" * 50)
+    sorted_numbers = [1, 3, 3, 3, 7, 9, 11]
+    targets = [3, 4, 11, 0, 12]
+    print(f"ソート済み配列: {sorted_numbers}")
+    print(f"探している値: {targets}")
+    print(f"lower_bound: {batch_search(sorted_numbers, targets, 'left')}")
+    print(f"upper_bound: {batch_search(sorted_numbers, targets, 'right')}")
+    print(f"インデックス: {batch_binary_search(sorted_numbers, targets)}")
@@ -0,0 +1,192 @@
+# ファイル上の二分探索 (Binary Search over Memory-Mapped Files)
+# キーの順に並んだ固定長レコードのファイルを mmap で開き、ファイル全体を読み込まずに探索する
+# （例: 8 バイトのキー + 8 バイトのオフセットからなる 16 バイトのレコード）
+#
+# 探索で読むのは二分探索が調べる log2(n) 個のキーだけなので、
+# 数十 GB のファイルでも必要なページだけが OS によって読み込まれる
+
+import mmap
+import os
+import struct
+
+DEFAULT_RECORD_FORMAT = "<QQ"  # キーとオフセット（リトルエンディアンの符号なし 64 ビット整数）
+SCAN_BATCH = 4096  # 範囲スキャンで一度に読むレコード数
+
+
+class RecordFile:
+    """ソート済みの固定長レコードのファイル"""
+
+    def __init__(self, path, record_format=DEFAULT_RECORD_FORMAT, key_format=None, key_offset=0):
+        """
+        Args:
+            path (str): ファイルのパス
+            record_format (str): 1レコードの struct 形式
+            key_format (str): キーの struct 形式（省略時はレコードの最初のフィールド）
+            key_offset (int): レコードの先頭からキーまでのバイト数
+        """
+        self.record = struct.Struct(record_format)
+        if key_format is None:
+            # "<QQ" なら "<Q": バイト順の指定と最初のフィールドだけを使う
+            order = record_format[0] if record_format[0] in "@=<>!" else ""
+            body = record_format[len(order):].lstrip()
+            digits = len(body) - len(body.lstrip("0123456789"))
+            key_format = order + body[:digits + 1]
+        self.key = struct.Struct(key_format)
+        self.key_offset = key_offset
+        self.record_size = self.record.size
+        if key_offset + self.key.size > self.record_size:
+            raise ValueError("key does not fit in the record")
+
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size % self.record_size:
+            self._file.close()
+            raise ValueError(f"file size {size} is not a multiple of the record size {self.record_size}")
+        self.count = size // self.record_size
+        self._map = None
+        if size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(self._map, "madvise"):
+                # 二分探索の読み方は飛び飛びなので、先読みしないように OS に伝える
+                self._map.madvise(mmap.MADV_RANDOM)
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """ファイルを閉じる"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def key_at(self, i):
+        """i 番目のレコードのキー"""
+        return self.key.unpack_from(self._map, i * self.record_size + self.key_offset)[0]
+
+    def record_at(self, i):
+        """i 番目のレコード（フィールドのタプル）"""
+        return self.record.unpack_from(self._map, i * self.record_size)
+
+    def lower_bound(self, key, lo=0, hi=None):
+        """
+        key 以上のキーを持つ最初のレコードの番号を返す
+
+        Args:
+            key: 探しているキー
+            lo (int): 探索範囲の左端
+            hi (int): 探索範囲の右端（この番号は含まない）
+
+        Returns:
+            int: レコードの番号（すべてのキーが key より小さい場合はレコード数）
+        """
+        if hi is None:
+            hi = self.count
+        unpack = self.key.unpack_from
+        data = self._map
+        size = self.record_size
+        offset = self.key_offset
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if unpack(data, mid * size + offset)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def upper_bound(self, key, lo=0, hi=None):
+        """
+        key より大きいキーを持つ最初のレコードの番号を返す
+
+        Returns:
+            int: レコードの番号（すべてのキーが key 以下の場合はレコード数）
+        """
+        if hi is None:
+            hi = self.count
+        unpack = self.key.unpack_from
+        data = self._map
+        size = self.record_size
+        offset = self.key_offset
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key < unpack(data, mid * size + offset)[0]:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def search(self, key):
+        """
+        key を持つ最初のレコードの番号を探す
+
+        Returns:
+            int: 見つかった場合はレコードの番号、見つからない場合は -1
+        """
+        i = self.lower_bound(key)
+        if i < self.count and self.key_at(i) == key:
+            return i
+        return -1
+
+    def lookup(self, key):
+        """
+        key を持つ最初のレコードを返す
+
+        Returns:
+            tuple: レコードのフィールド、見つからない場合は None
+        """
+        i = self.search(key)
+        return self.record_at(i) if i >= 0 else None
+
+    def scan(self, start, stop):
+        """
+        start <= キー < stop のレコードを順に生成する（範囲スキャン）
+
+        レコードは SCAN_BATCH 個ずつまとめて bytes に写してから取り出す。
+        mmap を指したままのバッファを残さないので、スキャンの途中でも close() できる
+        """
+        first = self.lower_bound(start)
+        last = self.lower_bound(stop, first)
+        size = self.record_size
+        for lo in range(first, last, SCAN_BATCH):
+            if self._map is None:
+                raise ValueError("scan on a closed RecordFile")
+            hi = min(lo + SCAN_BATCH, last)
+            yield from self.record.iter_unpack(self._map[lo * size:hi * size])
+
+
+def write_records(path, records, record_format=DEFAULT_RECORD_FORMAT):
+    """
+    レコードのタプルをそのままの順でファイルに書き込む（並べ替えは呼び出し側で行う）
+
+    Returns:
+        int: 書き込んだレコード数
+    """
+    packer = struct.Struct(record_format)
+    count = 0
+    with open(path, "wb") as f:
+        for record in records:
+            f.write(packer.pack(*record))
+            count += 1
+    return count
+
+
+# 使用例
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index.bin")
+        # キー 0, 3, 6, ... とオフセット（キー × 100）からなるレコード
+        write_records(path, ((key, key * 100) for key in range(0, 3000, 3)))
+
+        with RecordFile(path) as records:
+            print(f"レコード数: {len(records)}")
+            print(f"キー 300 のレコード: {records.lookup(300)}")
+            print(f"キー 301 のレコード: {records.lookup(301)}")
+            print(f"300 <= キー < 312 のレコード: {list(records.scan(300, 312))}")
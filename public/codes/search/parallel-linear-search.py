@@ -0,0 +1,266 @@
+# 大きなデータの線形探索 (Chunked / Parallel Linear Search)
+# 要素を1つずつ Python で調べる代わりに、まとまった範囲（チャンク）を一度に調べる
+#
+# - 数値の連続したバッファ（array, NumPy 配列, memoryview）: チャンクごとにまとめて比較する
+# - bytes: C 実装の find を使う
+# - 巨大なファイルに対する条件（述語）での探索: ファイルをチャンクに分けて複数のプロセスで調べ、
+#   どこかで見つかったら、それより後ろのチャンクの探索は打ち切る
+
+import mmap
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import Value
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHUNK_ITEMS = 1 << 20  # 1つのチャンクに含める要素の数
+CHECK_ITEMS = 1 << 14  # ワーカーが打ち切りを確かめる間隔（要素数）
+
+
+def find_value(buffer, target, start=0):
+    """
+    target と等しい最初の要素の位置を求める
+
+    Args:
+        buffer: list, bytes, bytearray, array, memoryview, NumPy 配列のいずれか
+        target: 探している値（bytes の場合は部分列でもよい）
+        start (int): 探索を始める位置
+
+    Returns:
+        int: 見つかった場合はインデックス、見つからない場合は -1
+    """
+    if isinstance(buffer, (bytes, bytearray)):
+        if isinstance(target, int):
+            target = bytes([target])
+        return buffer.find(target, start)
+
+    if isinstance(buffer, memoryview) and buffer.format == "B" and not isinstance(target, int):
+        return _find_bytes_in_view(buffer, target, start)
+
+    if np is not None and isinstance(buffer, np.ndarray):
+        return _find_numpy(buffer, target, start)
+
+    if np is not None and isinstance(buffer, (array, memoryview)):
+        return _find_numpy(np.frombuffer(buffer, dtype=_numpy_dtype(buffer)), target, start)
+
+    if isinstance(buffer, (list, tuple, array)):
+        # list.index / array.index は C で1つずつ比較するので、Python のループより速い
+        try:
+            return buffer.index(target, start)
+        except ValueError:
+            return -1
+
+    return _find_in_chunks(buffer, target, start)
+
+
+def _numpy_dtype(buffer):
+    typecode = buffer.typecode if isinstance(buffer, array) else buffer.format
+    return np.dtype(typecode)
+
+
+def _find_numpy(values, target, start):
+    # チャンクごとに比較し、見つかった時点で残りは調べない
+    for lo in range(start, len(values), CHUNK_ITEMS):
+        hits = np.flatnonzero(values[lo:lo + CHUNK_ITEMS] == target)
+        if len(hits):
+            return lo + int(hits[0])
+    return -1
+
+
+def _find_bytes_in_view(view, pattern, start):
+    # チャンクごとに bytes にして find する。境目をまたぐ出現のために、パターンの長さ - 1 だけ重ねて読む
+    overlap = len(pattern) - 1
+    for lo in range(start, len(view), CHUNK_ITEMS):
+        index = bytes(view[lo:lo + CHUNK_ITEMS + overlap]).find(pattern)
+        if index != -1:
+            return lo + index
+    return -1
+
+
+def _find_in_chunks(view, target, start):
+    # NumPy がない場合: チャンクを list にしてから C 実装の index で探す
+    view = memoryview(view)
+    for lo in range(start, len(view), CHUNK_ITEMS):
+        chunk = view[lo:lo + CHUNK_ITEMS].tolist()
+        try:
+            return lo + chunk.index(target)
+        except ValueError:
+            continue
+    return -1
+
+
+def find_all(buffer, target):
+    """
+    target と等しいすべての要素の位置を求める
+
+    Returns:
+        list: インデックスのリスト（昇順）
+    """
+    if isinstance(buffer, (bytes, bytearray)):
+        if isinstance(target, int):
+            target = bytes([target])
+        result = []
+        i = buffer.find(target)
+        while i != -1:
+            result.append(i)
+            i = buffer.find(target, i + 1)
+        return result
+    if np is not None and isinstance(buffer, (np.ndarray, array, memoryview)):
+        values = buffer if isinstance(buffer, np.ndarray) else np.frombuffer(buffer, dtype=_numpy_dtype(buffer))
+        return np.flatnonzero(values == target).tolist()
+    return [i for i, value in enumerate(buffer) if value == target]
+
+
+# ---- ファイルに対する並列探索 ----
+
+_state = {}
+
+
+def _init_worker(found):
+    _state["found"] = found
+    _state["maps"] = {}
+
+
+def _open_map(path):
+    maps = _state["maps"]
+    if path not in maps:
+        with open(path, "rb") as f:
+            maps[path] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return maps[path]
+
+
+def _already_found_before(start):
+    found = _state["found"].value
+    return found != -1 and found < start
+
+
+def _record_found(index):
+    found = _state["found"]
+    with found.get_lock():
+        if found.value == -1 or index < found.value:
+            found.value = index
+
+
+def _scan_chunk(path, typecode, start, stop, predicate, vectorized):
+    """要素 start から stop までを調べ、条件を満たす最初の要素の位置を返す（ない場合は -1）"""
+    data = _open_map(path)
+    itemsize = array(typecode).itemsize
+    view = memoryview(data)[start * itemsize:stop * itemsize].cast(typecode)
+    try:
+        for lo in range(0, len(view), CHECK_ITEMS):
+            # 前のチャンクで見つかっていれば、このチャンクを調べても答えは変わらない
+            if _already_found_before(start):
+                return -1
+            block = view[lo:lo + CHECK_ITEMS]
+            if vectorized:
+                hits = np.flatnonzero(predicate(np.frombuffer(block, dtype=np.dtype(typecode))))
+                offset = int(hits[0]) if len(hits) else -1
+            else:
+                offset = next((i for i, value in enumerate(block.tolist()) if predicate(value)), -1)
+            if offset != -1:
+                index = start + lo + offset
+                _record_found(index)
+                return index
+        return -1
+    finally:
+        view.release()
+
+
+def _scan_bytes(path, pattern, start, stop):
+    """バイト位置 start から始まる出現を stop の手前まで探す"""
+    if _already_found_before(start):
+        return -1
+    data = _open_map(path)
+    # チャンクの境目をまたぐ出現も見つけられるよう、パターンの長さ - 1 だけ余分に読む
+    index = data.find(pattern, start, min(stop + len(pattern) - 1, len(data)))
+    if index != -1:
+        _record_found(index)
+    return index
+
+
+def _first_match(tasks, workers, initargs):
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as pool:
+        futures = {pool.submit(fn, *args): args for fn, args in tasks}
+        best = -1
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            index = future.result()
+            if index != -1 and (best == -1 or index < best):
+                best = index
+                # まだ始まっていない後ろのチャンクは取り消す
+                for other in futures:
+                    if other is not future and futures[other][2] > index:
+                        other.cancel()
+        return best
+
+
+def parallel_find(path, predicate, typecode="q", workers=None, chunk_items=CHUNK_ITEMS, vectorized=False):
+    """
+    数値の並んだファイルから、条件を満たす最初の要素を複数のプロセスで探す
+
+    Args:
+        path (str): 探索するファイル（typecode の値がそのまま並んだもの）
+        predicate: 値を受け取って真偽を返す関数（プロセス間で送るため、モジュールの関数にする）
+        typecode (str): 値の型（array の型コード）
+        workers (int): プロセス数（省略時は CPU の数）
+        chunk_items (int): 1つのチャンクに含める要素の数
+        vectorized (bool): True なら predicate は NumPy 配列を受け取り、真偽の配列を返す
+
+    Returns:
+        int: 見つかった場合は要素のインデックス、見つからない場合は -1
+    """
+    if vectorized and np is None:
+        raise RuntimeError("vectorized predicates need NumPy")
+    itemsize = array(typecode).itemsize
+    count = os.path.getsize(path) // itemsize
+    if count == 0:
+        return -1
+    found = Value("q", -1)
+    tasks = [(_scan_chunk, (path, typecode, lo, min(lo + chunk_items, count), predicate, vectorized))
+             for lo in range(0, count, chunk_items)]
+    return _first_match(tasks, workers or os.cpu_count() or 1, (found,))
+
+
+def parallel_find_bytes(path, pattern, workers=None, chunk_bytes=CHUNK_ITEMS * 16):
+    """
+    ファイルの中でバイト列 pattern が最初に現れる位置を複数のプロセスで探す
+
+    Returns:
+        int: 見つかった場合はバイト位置、見つからない場合は -1
+    """
+    if not pattern:
+        return 0
+    size = os.path.getsize(path)
+    if size == 0:
+        return -1
+    found = Value("q", -1)
+    tasks = [(_scan_bytes, (path, pattern, lo, min(lo + chunk_bytes, size)))
+             for lo in range(0, size, chunk_bytes)]
+    return _first_match(tasks, workers or os.cpu_count() or 1, (found,))
+
+
+def is_negative(value):
+    """使用例で使う述語"""
+    return value < 0
+
+
+# 使用例
+if __name__ == "__main__":
+    import tempfile
+
+    numbers = array("q", range(2_000_000))
+    print(f"値 1234567 の位置: {find_value(numbers, 1234567)}")
+    print(f"b'needle' の位置: {find_value(b'haystack with a needle inside', b'needle')}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "values.bin")
+        numbers[1_500_000] = -1
+        with open(path, "wb") as f:
+            numbers.tofile(f)
+        print(f"最初の負の値の位置: {parallel_find(path, is_negative, 'q', chunk_items=1 << 18)}")
+        print(f"バイト列の位置: {parallel_find_bytes(path, numbers[1_500_000:1_500_002].tobytes(), chunk_bytes=1 << 20)}")
@@ -0,0 +1,224 @@
+# 静的探索インデックス (Static Search Index)
+# 一度だけ作って何度も検索する読み取り専用の表を、キャッシュに優しい並びに組み替える
+#
+# - Eytzinger 配置: ソート済み配列を二分探索木の幅優先の順に並べる。
+#   探索で調べる位置が配列の先頭付近に集まり、上の段はいつもキャッシュに載る
+# - 暗黙の B 木配置: block 個ずつのキーを1つのノードにまとめる。
+#   1つのノードは連続したメモリなので、1回の読み込みで block 個を比較できる
+#
+# どちらも値は型付きの array（または NumPy 配列）に詰めて持ち、Python の int オブジェクトのリストは使わない
+
+from array import array
+from bisect import bisect_left
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def typecode_for(values):
+    """値をすべて表せる array の型コードを選ぶ（整数なら 'q'、それ以外は 'd'）"""
+    return "q" if all(isinstance(v, int) for v in values) else "d"
+
+
+class EytzingerIndex:
+    """Eytzinger（幅優先）配置のソート済み配列"""
+
+    def __init__(self, sorted_values):
+        """
+        Args:
+            sorted_values (list): ソート済みの値
+        """
+        n = len(sorted_values)
+        self.n = n
+        typecode = typecode_for(sorted_values)
+        # 位置 0 は使わない（ノード k の子は 2k と 2k + 1）
+        self.keys = array(typecode, [0]) * (n + 1)
+        # ranks[k] はノード k の値のソート済み配列での位置。ranks[0] は「見つからない」を表す n
+        self.ranks = array("q", [n]) * (n + 1)
+
+        # 中間順（in-order）に木をたどると、ソート済みの順番になる
+        i = 0
+        stack = []
+        k = 1
+        while stack or k <= n:
+            while k <= n:
+                stack.append(k)
+                k *= 2
+            k = stack.pop()
+            self.keys[k] = sorted_values[i]
+            self.ranks[k] = i
+            i += 1
+            k = 2 * k + 1
+
+        self._np_keys = None
+        self._np_ranks = None
+
+    def find_slot(self, target):
+        """target 以上の最初の値がある Eytzinger 配置での位置（ない場合は 0）"""
+        keys = self.keys
+        n = self.n
+        k = 1
+        # 比較結果をそのまま添字に足すので、分岐は while の条件だけ
+        while k <= n:
+            k = 2 * k + (keys[k] < target)
+        # 最後に左の子へ進んだ節まで戻る: 末尾の 1 のビットと、その上の 0 を取り除く
+        return k // (2 * ((k + 1) & ~k))
+
+    def lower_bound(self, target):
+        """
+        target 以上の最初の値の、ソート済み配列での位置を返す
+
+        Returns:
+            int: 位置（すべての値が target より小さい場合は n）
+        """
+        return self.ranks[self.find_slot(target)]
+
+    def search(self, target):
+        """
+        target を探す
+
+        Returns:
+            int: 見つかった場合はソート済み配列でのインデックス、見つからない場合は -1
+        """
+        k = self.find_slot(target)
+        if k and self.keys[k] == target:
+            return self.ranks[k]
+        return -1
+
+    def lower_bound_many(self, targets):
+        """
+        多数の値の lower_bound を一度に求める
+
+        NumPy があれば、全部の値を木の1段ずつ同時に進める（段数は log2 n 回だけ）
+
+        Returns:
+            list: targets と同じ順の位置
+        """
+        if np is None:
+            return [self.lower_bound(t) for t in targets]
+        if self._np_keys is None:
+            self._np_keys = np.frombuffer(self.keys, dtype=np.int64 if self.keys.typecode == "q" else np.float64)
+            self._np_ranks = np.frombuffer(self.ranks, dtype=np.int64)
+        keys = self._np_keys
+        targets = np.asarray(targets)
+        k = np.ones(len(targets), dtype=np.int64)
+        for _ in range(self.n.bit_length()):
+            inside = k <= self.n
+            step = keys[np.where(inside, k, 0)] < targets
+            k = np.where(inside, 2 * k + step, k)
+        k //= 2 * ((k + 1) & ~k)
+        return self._np_ranks[k].tolist()
+
+
+class BTreeIndex:
+    """暗黙の B 木配置のソート済み配列（ポインタを持たず、子の位置は計算で求める）"""
+
+    def __init__(self, sorted_values, block=16):
+        """
+        Args:
+            sorted_values (list): ソート済みの値
+            block (int): 1つのノードに入れるキーの数（キャッシュラインの大きさに合わせる）
+        """
+        if block < 1:
+            raise ValueError("block must be at least 1")
+        n = len(sorted_values)
+        self.n = n
+        self.block = block
+        self.nodes = -(-n // block)  # 切り上げ
+        typecode = typecode_for(sorted_values)
+        # 余った場所には最大の値を置くので、中間順で必ず最後に来る
+        pad = sorted_values[-1] if n else 0
+        self.keys = array(typecode, [pad]) * (self.nodes * block)
+        self.ranks = array("q", [n]) * (self.nodes * block)
+
+        # ノード j の i 番目の子は j * (block + 1) + i + 1
+        i = 0
+        stack = [(0, 0)]
+        while stack:
+            node, child = stack.pop()
+            if node >= self.nodes:
+                continue
+            if child > 0:
+                slot = node * block + child - 1
+                if i < n:
+                    self.keys[slot] = sorted_values[i]
+                    self.ranks[slot] = i
+                i += 1
+            if child < block:
+                stack.append((node, child + 1))
+            stack.append((node * (block + 1) + child + 1, 0))
+
+    def find_slot(self, target):
+        """target 以上の最初の値がある位置（ない場合は -1）"""
+        keys = self.keys
+        block = self.block
+        slot = -1
+        node = 0
+        while node < self.nodes:
+            start = node * block
+            # ノードの中は連続しているので、C 実装の bisect で一度に調べる
+            i = bisect_left(keys, target, start, start + block) - start
+            if i < block:
+                # 下の段で見つかる候補は、いつも今の候補より左（小さい）
+                slot = start + i
+            node = node * (block + 1) + i + 1
+        return slot
+
+    def lower_bound(self, target):
+        """
+        target 以上の最初の値の、ソート済み配列での位置を返す
+
+        Returns:
+            int: 位置（すべての値が target より小さい場合は n）
+        """
+        slot = self.find_slot(target)
+        return self.ranks[slot] if slot >= 0 else self.n
+
+    def search(self, target):
+        """
+        target を探す
+
+        Returns:
+            int: 見つかった場合はソート済み配列でのインデックス、見つからない場合は -1
+        """
+        slot = self.find_slot(target)
+        if slot >= 0 and self.ranks[slot] < self.n and self.keys[slot] == target:
+            return self.ranks[slot]
+        return -1
+
+    def lower_bound_many(self, targets):
+        """多数の値の lower_bound を一度に求める"""
+        return [self.lower_bound(t) for t in targets]
+
+
+def build_index(sorted_values, layout="eytzinger", block=16):
+    """
+    静的探索インデックスを作る
+
+    Args:
+        sorted_values (list): ソート済みの値
+        layout (str): "eytzinger" または "btree"
+        block (int): B 木配置の1ノードあたりのキーの数
+
+    Returns:
+        EytzingerIndex または BTreeIndex
+    """
+    if layout == "eytzinger":
+        return EytzingerIndex(sorted_values)
+    if layout == "btree":
+        return BTreeIndex(sorted_values, block)
+    raise ValueError(f"unknown layout: {layout}")
+
+
+# 使用例
+if __name__ == "__main__":
+    sorted_numbers = [1, 3, 5, 7, 9, 11, 13, 15, 17, 19]
+    target = 11
+
+    for layout in ("eytzinger", "btree"):
+        index = build_index(sorted_numbers, layout, block=3)
+        print(f"{layout} 配置: {list(index.keys)}")
+        print(f"  値 {target} のインデックス: {index.search(target)}")
+        print(f"  値 12 以上の最初の位置: {index.lower_bound(12)}")
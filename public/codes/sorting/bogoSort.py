@@ -1,5 +1,6 @@
 import random
-import time
+
+from sortEvents import SWAP, MARK_SORTED, run_visual
 
 def is_sorted(arr):
     for i in range(len(arr) - 1):
@@ -13,18 +14,15 @@ def shuffle(arr):
         index = random.randint(0, n - 1)
         n -= 1
         arr[n], arr[index] = arr[index], arr[n]
-    return arr
+        yield SWAP, n, index
+
+def bogo_sort(array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting, on_step=None):
+    run_visual(bogo_sort_steps(array), array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting, on_step)
 
-def bogo_sort(array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting):
+def bogo_sort_steps(array):
     n = len(array)
 
     while not is_sorted(array):
-        if not is_sorting.current: return
-        array = shuffle(array)
-        set_array(list(array))
-        set_comparing_indices([])
-        set_swapping_indices([])
-        time.sleep(speed / 1000.0)
+        yield from shuffle(array)
 
-    set_sorted_indices(list(range(n)))
-    set_comparing_indices([])
\ No newline at end of file
+    yield MARK_SORTED, 0, n
@@ -1,17 +1,29 @@
-def bucket_sort(array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting):
+import random
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+from mergeSort import merge_sort_buffered
+from sortEvents import READ, WRITE, MARK_SORTED, run_visual
+from sortKeys import sort_by_key
+
+OVERSAMPLING = 32  # 境界を選ぶときにバケット1つあたりに取る標本の数
+INSERTION_CUTOFF = 32  # この大きさ以下のバケットは挿入ソートで並べる
+PARALLEL_THRESHOLD = 100000
+
+
+def bucket_sort(array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting, on_step=None):
+    run_visual(bucket_sort_steps(array), array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting, on_step)
+
+
+def bucket_sort_steps(array):
     n = len(array)
 
     if n == 0:
-        set_sorted_indices(list(range(n)))
-        set_comparing_indices([])
         return
 
     max_val = array[0]
     for i in range(1, n):
-        if not is_sorting.current: return
-        set_comparing_indices([i])
-        set_array(list(array))
-        time.sleep(speed / 1000.0)
+        yield READ, i, i
         if array[i] > max_val:
             max_val = array[i]
 
@@ -19,35 +31,78 @@ def bucket_sort(array, set_array, set_comparing_indices, set_swapping_indices, s
     buckets = [[] for _ in range(num_buckets)]
 
     for i in range(n):
-        if not is_sorting.current: return
-        set_comparing_indices([i])
-        set_array(list(array))
-        time.sleep(speed / 1000.0)
+        yield READ, i, i
         bucket_index = min(int(array[i] * num_buckets / (max_val + 1)), num_buckets - 1)
         buckets[bucket_index].append(array[i])
 
     for i in range(num_buckets):
-        if not is_sorting.current: return
-        # Sort each bucket (using insertion sort for simplicity, can be any sort)
-        for j in range(1, len(buckets[i])):
-            key = buckets[i][j]
-            k = j - 1
-            while k >= 0 and buckets[i][k] > key:
-                buckets[i][k + 1] = buckets[i][k]
-                k -= 1
-            buckets[i][k + 1] = key
+        # 各バケットを並べる（簡単のため挿入ソート。どのソートでもよい）
+        insertion_sort_bucket(buckets[i])
 
     current_index = 0
     for i in range(num_buckets):
         for j in range(len(buckets[i])):
-            if not is_sorting.current: return
             array[current_index] = buckets[i][j]
-            set_array(list(array))
-            set_sorted_indices(lambda prev: prev + [current_index])
-            time.sleep(speed / 1000.0)
+            yield WRITE, current_index, buckets[i][j]
+            yield MARK_SORTED, current_index, current_index + 1
             current_index += 1
 
-    set_sorted_indices(list(range(n)))
-    set_comparing_indices([])
+    yield MARK_SORTED, 0, n
+
+
+def choose_boundaries(values, num_buckets, oversampling=OVERSAMPLING):
+    # 無作為標本の分位点を境界にするので、偏ったデータでもほぼ同じ大きさのバケットに分かれる
+    sample = sorted(random.sample(values, min(len(values), num_buckets * oversampling)))
+    step = len(sample) / num_buckets
+    boundaries = []
+    for k in range(1, num_buckets):
+        candidate = sample[int(k * step)]
+        if not boundaries or boundaries[-1] < candidate:
+            boundaries.append(candidate)
+    return boundaries
+
+def insertion_sort_bucket(bucket):
+    for j in range(1, len(bucket)):
+        key = bucket[j]
+        k = j - 1
+        while k >= 0 and bucket[k] > key:
+            bucket[k + 1] = bucket[k]
+            k -= 1
+        bucket[k + 1] = key
+    return bucket
+
+def sort_bucket(bucket):
+    # 小さなバケット（ほとんどの場合）は挿入ソートで並べる。運悪く大きくなったバケットは
+    # マージソートに切り替えるので、2乗の時間にはならない
+    if len(bucket) <= INSERTION_CUTOFF:
+        return insertion_sort_bucket(bucket)
+    return merge_sort_buffered(bucket)
+
+def sample_bucket_sort(values, num_buckets=None, workers=None, key=None, reverse=False):
+    if key is not None or reverse:
+        return sort_by_key(sample_bucket_sort, list(values), key, reverse)
+    values = list(values)
+    n = len(values)
+    if n < 2:
+        return values
+
+    num_buckets = num_buckets or max(1, int(n**0.5))
+    boundaries = choose_boundaries(values, num_buckets)
+    buckets = [[] for _ in range(len(boundaries) + 1)]
+    for value in values:
+        buckets[bisect_right(boundaries, value)].append(value)
+
+    if workers and workers > 1 and n >= PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor(workers) as pool:
+            chunksize = max(1, len(buckets) // (workers * 4))
+            buckets = list(pool.map(sort_bucket, buckets, chunksize=chunksize))
+    else:
+        buckets = [sort_bucket(bucket) for bucket in buckets]
 
-import time
\ No newline at end of file
+    # リストを連結せず、各バケットを最終的な位置へ直接書き込む
+    output = values
+    start = 0
+    for bucket in buckets:
+        output[start:start + len(bucket)] = bucket
+        start += len(bucket)
+    return output
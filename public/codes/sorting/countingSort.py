@@ -1,50 +1,135 @@
-def counting_sort(array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting):
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from sortEvents import READ, WRITE, MARK_SORTED, run_visual
+
+DENSE_RANGE_FACTOR = 4  # キーの範囲が n のこの倍数以下なら配列で数える
+PARALLEL_THRESHOLD = 200000
+
+
+def counting_sort(array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting, on_step=None):
+    run_visual(counting_sort_steps(array), array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting, on_step)
+
+
+def counting_sort_steps(array):
     n = len(array)
 
     if n == 0:
-        set_sorted_indices(list(range(n)))
-        set_comparing_indices([])
         return
 
-    max_val = array[0]
+    min_val = max_val = array[0]
     for i in range(1, n):
-        if not is_sorting.current: return
-        set_comparing_indices([i])
-        set_array(list(array))
-        time.sleep(speed / 1000.0)
+        yield READ, i, i
         if array[i] > max_val:
             max_val = array[i]
+        elif array[i] < min_val:
+            min_val = array[i]
 
-    count = [0] * (max_val + 1)
+    # 最小値を引くので負のキーも扱え、表は実際の範囲だけで済む
+    size = max_val - min_val + 1
+    count = [0] * size
     output = [0] * n
 
     for i in range(n):
-        if not is_sorting.current: return
-        set_comparing_indices([i])
-        set_array(list(array))
-        time.sleep(speed / 1000.0)
-        count[array[i]] += 1
-
-    for i in range(1, max_val + 1):
-        if not is_sorting.current: return
+        yield READ, i, i
+        count[array[i] - min_val] += 1
+
+    for i in range(1, size):
         count[i] += count[i - 1]
 
     for i in range(n - 1, -1, -1):
-        if not is_sorting.current: return
-        set_comparing_indices([i])
-        set_array(list(array))
-        time.sleep(speed / 1000.0)
-        output[count[array[i]] - 1] = array[i]
-        count[array[i]] -= 1
+        yield READ, i, i
+        output[count[array[i] - min_val] - 1] = array[i]
+        count[array[i] - min_val] -= 1
 
     for i in range(n):
-        if not is_sorting.current: return
         array[i] = output[i]
-        set_array(list(array))
-        set_sorted_indices(lambda prev: prev + [i])
-        time.sleep(speed / 1000.0)
+        yield WRITE, i, output[i]
+        yield MARK_SORTED, i, i + 1
+
+    yield MARK_SORTED, 0, n
+
+
+def counting_sort_array(values, mode="auto", workers=None, key=None, reverse=False):
+    # 安定: 元の要素を累積和の位置に置くので、同じキーの要素は入力の順序を保ち、
+    # 1, 1.0, True のような値も1つにまとめられない
+    items = list(values)
+    n = len(items)
+    if n == 0:
+        return []
+    keys = [key(x) for x in items] if key is not None else items
+    parallel = workers and workers > 1 and n >= PARALLEL_THRESHOLD
+
+    all_int = all(isinstance(k, int) for k in keys)
+    if mode == "auto":
+        # 配列の添字にできるのは整数のキーだけ。それ以外は辞書で数える
+        mode = "dense" if all_int and max(keys) - min(keys) + 1 <= DENSE_RANGE_FACTOR * n else "sparse"
+
+    if mode == "dense":
+        if not all_int:
+            raise TypeError("dense counting sort needs integer keys; use mode='sparse'")
+        low = min(keys)
+        size = max(keys) - low + 1
+        if parallel:
+            count = _parallel_counts(keys, workers, low, size)
+        else:
+            count = [0] * size
+            for k in keys:
+                count[k - low] += 1
+        # 個数を各キーの出力先の先頭位置に変える
+        start = [0] * size
+        total = 0
+        for slot in (range(size - 1, -1, -1) if reverse else range(size)):
+            start[slot] = total
+            total += count[slot]
+        output = [None] * n
+        for k, item in zip(keys, items):
+            slot = k - low
+            output[start[slot]] = item
+            start[slot] += 1
+        return output
+
+    if mode == "sparse":
+        # 辞書のヒストグラム: メモリはキーの範囲ではなく、異なるキーの数に比例する
+        histogram = _parallel_histogram(keys, workers) if parallel else Counter(keys)
+        start = {}
+        total = 0
+        for k in sorted(histogram, reverse=reverse):
+            start[k] = total
+            total += histogram[k]
+        output = [None] * n
+        for k, item in zip(keys, items):
+            output[start[k]] = item
+            start[k] += 1
+        return output
+
+    raise ValueError(f"unknown mode: {mode}")
+
+def _chunk_histogram(chunk):
+    return Counter(chunk)
+
+def _chunk_counts(chunk, low, size):
+    count = [0] * size
+    for k in chunk:
+        count[k - low] += 1
+    return count
+
+def _split(values, workers):
+    bounds = [len(values) * k // workers for k in range(workers + 1)]
+    return [values[bounds[k]:bounds[k + 1]] for k in range(workers)]
 
-    set_sorted_indices(list(range(n)))
-    set_comparing_indices([])
+def _parallel_histogram(values, workers):
+    histogram = Counter()
+    with ProcessPoolExecutor(workers) as pool:
+        for partial in pool.map(_chunk_histogram, _split(values, workers)):
+            histogram.update(partial)
+    return histogram
 
-import time
\ No newline at end of file
+def _parallel_counts(values, workers, low, size):
+    chunks = _split(values, workers)
+    count = [0] * size
+    with ProcessPoolExecutor(workers) as pool:
+        for partial in pool.map(_chunk_counts, chunks, [low] * len(chunks), [size] * len(chunks)):
+            for slot, c in enumerate(partial):
+                count[slot] += c
+    return count
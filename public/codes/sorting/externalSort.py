@@ -0,0 +1,92 @@
+import heapq
+import os
+import sys
+import tempfile
+
+from radixSort import radix_sort_records
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024  # バイト
+DEFAULT_FAN_IN = 64
+LINE_OVERHEAD = sys.getsizeof(b"") + 8  # バイト オブジェクトのヘッダーとリストの1要素分
+
+
+def external_sort(input_path, output_path, key=None, memory_budget=DEFAULT_MEMORY_BUDGET,
+                  fan_in=DEFAULT_FAN_IN, chunk_sort="timsort", tmp_dir=None):
+    # メモリに収まらない大きさもありうる、改行区切りのファイルを並べ替える。
+    # chunk_sort="radix" は各行を整数値の順に並べ、行の内容はバイト単位でそのまま残す
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    if chunk_sort not in ("timsort", "radix"):
+        raise ValueError(f"unknown chunk_sort: {chunk_sort}")
+    if chunk_sort == "radix" and key is not None:
+        raise ValueError("key is not supported with chunk_sort='radix'")
+    if chunk_sort == "radix":
+        key = int
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as work_dir:
+        runs = write_sorted_runs(input_path, work_dir, key, memory_budget, chunk_sort)
+
+        # マージの各パスは fan_in 個のランを読んで1つを書くので、メモリの予算をそれらで分ける
+        buffer_size = max(4096, memory_budget // (fan_in + 1))
+        generation = 0
+        while len(runs) > fan_in:
+            merged = []
+            for start in range(0, len(runs), fan_in):
+                group = runs[start:start + fan_in]
+                path = os.path.join(work_dir, f"merge-{generation}-{start // fan_in}.run")
+                merge_runs(group, path, key, buffer_size)
+                for run in group:
+                    os.remove(run)
+                merged.append(path)
+            runs = merged
+            generation += 1
+
+        merge_runs(runs, output_path, key, buffer_size)
+
+
+def write_sorted_runs(input_path, work_dir, key, memory_budget, chunk_sort):
+    runs = []
+    chunk = []
+    used = 0
+    with open(input_path, "rb") as source:
+        for line in source:
+            if line.endswith(b"\n"):
+                line = line[:-1]
+            chunk.append(line)
+            used += len(line) + LINE_OVERHEAD
+            if used >= memory_budget:
+                runs.append(write_run(chunk, work_dir, len(runs), key, chunk_sort))
+                chunk = []
+                used = 0
+    if chunk or not runs:
+        runs.append(write_run(chunk, work_dir, len(runs), key, chunk_sort))
+    return runs
+
+
+def write_run(chunk, work_dir, index, key, chunk_sort):
+    if chunk_sort == "radix":
+        # 並べ替えに使うのは解析したキーだけで、元の行のバイト列はそのまま書き戻す
+        chunk = radix_sort_records([int(line) for line in chunk], chunk)
+    else:
+        # list.sort は TimSort なので、一部が整列済みのランはほぼ線形時間で並ぶ
+        chunk.sort(key=key)
+    path = os.path.join(work_dir, f"run-{index}.run")
+    with open(path, "wb") as f:
+        # ファイルのバッファーを通して1行ずつ書く（連結するとランの複製をもう1つ持つことになる）
+        f.writelines(line + b"\n" for line in chunk)
+    return path
+
+
+def read_run(path, buffer_size):
+    with open(path, "rb", buffering=buffer_size) as f:
+        for line in f:
+            yield line[:-1]
+
+
+def merge_runs(paths, output_path, key, buffer_size):
+    # ヒープによる k-way マージ。heapq.merge は同じ値のレコードをランの順に保つ
+    readers = [read_run(path, buffer_size) for path in paths]
+    with open(output_path, "wb", buffering=buffer_size) as out:
+        for line in heapq.merge(*readers, key=key):
+            out.write(line)
+            out.write(b"\n")
@@ -1,20 +1,69 @@
-def heap_sort(arr):
+from sortKeys import sort_by_key
+
+def heap_sort(arr, key=None, reverse=False, arity=2):
+    if key is not None or reverse:
+        arr[:] = sort_by_key(lambda a: heap_sort(a, arity=arity), arr, key, reverse)
+        return arr
+    if arity < 2:
+        raise ValueError("arity must be at least 2")
     n = len(arr)
-    for i in range(n // 2 - 1, -1, -1):
-        heapify(arr, n, i)
+    # ボトムアップの構築: 最後の親から順にふるい落とすと全体で O(n)
+    for i in range((n - 2) // arity, -1, -1):
+        heapify(arr, n, i, arity)
     for i in range(n - 1, 0, -1):
         arr[i], arr[0] = arr[0], arr[i]
-        heapify(arr, i, 0)
+        heapify(arr, i, 0, arity)
     return arr
 
-def heapify(arr, n, i):
-    largest = i
-    l = 2 * i + 1
-    r = 2 * i + 2
-    if l < n and arr[i] < arr[l]:
-        largest = l
-    if r < n and arr[largest] < arr[r]:
-        largest = r
-    if largest != i:
-        arr[i], arr[largest] = arr[largest], arr[i]
-        heapify(arr, n, largest)
\ No newline at end of file
+def heapify(arr, n, i, arity=2):
+    # Floyd のふるい落とし: 値とは比較せずに大きい方の子をたどって穴を葉まで下ろし、
+    # そこから値を上へ戻す（ほとんど遠くまでは戻らない）
+    value = arr[i]
+    hole = i
+    child = arity * hole + 1
+    while child < n:
+        largest = child
+        if arity == 2:
+            if child + 1 < n and arr[child] < arr[child + 1]:
+                largest = child + 1
+        else:
+            for c in range(child + 1, min(child + arity, n)):
+                if arr[largest] < arr[c]:
+                    largest = c
+        arr[hole] = arr[largest]
+        hole = largest
+        child = arity * hole + 1
+    while hole > i:
+        parent = (hole - 1) // arity
+        if not arr[parent] < value:
+            break
+        arr[hole] = arr[parent]
+        hole = parent
+    arr[hole] = value
+
+def heap_sort_range(arr, begin, end):
+    # arr[begin:end] をその場で二分ヒープソートする（クイックソート系の退避先）
+    size = end - begin
+    for i in range((size - 2) // 2, -1, -1):
+        heapify_range(arr, size, i, begin)
+    for i in range(size - 1, 0, -1):
+        arr[begin], arr[begin + i] = arr[begin + i], arr[begin]
+        heapify_range(arr, i, 0, begin)
+
+def heapify_range(arr, n_heap, i, offset):
+    value = arr[offset + i]
+    hole = i
+    child = 2 * hole + 1
+    while child < n_heap:
+        if child + 1 < n_heap and arr[offset + child] < arr[offset + child + 1]:
+            child += 1
+        arr[offset + hole] = arr[offset + child]
+        hole = child
+        child = 2 * hole + 1
+    while hole > i:
+        parent = (hole - 1) // 2
+        if not arr[offset + parent] < value:
+            break
+        arr[offset + hole] = arr[offset + parent]
+        hole = parent
+    arr[offset + hole] = value
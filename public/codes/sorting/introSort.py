@@ -1,121 +1,607 @@
-def intro_sort(array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting):
+from heapSort import heap_sort_range
+from sortEvents import COMPARE, SWAP, WRITE, MARK_SORTED, run_visual
+from sortKeys import sort_by_key
+
+# パターン破りクイックソート (pdqsort): 分割済みの範囲を見つけ、悪いピボットを
+# 要素の入れ替えで崩し、比較をブロック単位で行って分割するイントロソート
+INSERTION_SORT_THRESHOLD = 24
+NINTHER_THRESHOLD = 128
+PARTIAL_INSERTION_SORT_LIMIT = 8
+BLOCK_SIZE = 64
+
+
+def intro_sort(array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting, on_step=None):
+    run_visual(intro_sort_steps(array), array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting, on_step)
+
+
+def log2_floor(n):
+    log = 0
+    while n > 1:
+        n >>= 1
+        log += 1
+    return log
+
+
+def intro_sort_steps(array):
     n = len(array)
-    MAX_DEPTH_FACTOR = 2  # log2(n) * 2
+    arr = array
+    offsets_l = [0] * BLOCK_SIZE  # すべてのブロック分割で使い回す
+    offsets_r = [0] * BLOCK_SIZE
 
-    def swap(arr, i, j):
+    def swap(i, j):
         arr[i], arr[j] = arr[j], arr[i]
+        yield SWAP, i, j
 
-    def median_of_three(arr, a, b, c):
-        if arr[a] < arr[b]:
-            if arr[b] < arr[c]: return b
-            elif arr[a] < arr[c]: return c
-            else: return a
-        else:
-            if arr[a] < arr[c]: return a
-            elif arr[b] < arr[c]: return c
-            else: return b
-
-    def partition(arr, low, high):
-        pivot_index = median_of_three(arr, low, (low + high) // 2, high)
-        swap(arr, pivot_index, high)  # Move pivot to end
-        pivot = arr[high]
-        i = (low - 1)
-
-        for j in range(low, high):
-            if not is_sorting.current: return
-            set_comparing_indices([j, high])
-            set_array(list(arr))
-            time.sleep(speed / 1000.0)
-
-            if arr[j] < pivot:
-                i += 1
-                set_swapping_indices([i, j])
-                swap(arr, i, j)
-                set_array(list(arr))
-                time.sleep(speed / 1000.0)
-                set_swapping_indices([])
-        set_swapping_indices([i + 1, high])
-        swap(arr, i + 1, high)
-        set_array(list(arr))
-        time.sleep(speed / 1000.0)
-        set_swapping_indices([])
-        return (i + 1)
-
-    def heapify(arr, n_heap, i, offset):
-        largest = i
-        l = 2 * i + 1
-        r = 2 * i + 2
-
-        if l < n_heap:
-            set_comparing_indices([offset + largest, offset + l])
-            set_array(list(arr))
-            time.sleep(speed / 1000.0)
-            if arr[offset + l] > arr[offset + largest]:
-                largest = l
-
-        if r < n_heap:
-            set_comparing_indices([offset + largest, offset + r])
-            set_array(list(arr))
-            time.sleep(speed / 1000.0)
-            if arr[offset + r] > arr[offset + largest]:
-                largest = r
-
-        if largest != i:
-            set_swapping_indices([offset + i, offset + largest])
-            swap(arr, offset + i, offset + largest)
-            set_array(list(arr))
-            time.sleep(speed / 1000.0)
-            set_swapping_indices([])
-            heapify(arr, n_heap, largest, offset)
-
-    def heap_sort_intro(arr, low, high):
-        size = high - low + 1
-        for i in range(size // 2 - 1, -1, -1):
-            heapify(arr, size, i, low)
+    def sort2(a, b):
+        yield COMPARE, a, b
+        if arr[b] < arr[a]:
+            yield from swap(a, b)
+
+    def sort3(a, b, c):
+        yield from sort2(a, b)
+        yield from sort2(b, c)
+        yield from sort2(a, b)
 
+    def insertion_sort(begin, end, guarded):
+        # arr[begin - 1] が範囲内のどの要素以下でもあるとわかっていれば番兵の確認を省く
+        for cur in range(begin + 1, end):
+            yield COMPARE, cur, cur - 1
+            if not arr[cur] < arr[cur - 1]:
+                continue
+            tmp = arr[cur]
+            sift = cur
+            while True:
+                arr[sift] = arr[sift - 1]
+                yield WRITE, sift, arr[sift]
+                sift -= 1
+                if guarded and sift == begin:
+                    break
+                yield COMPARE, cur, sift - 1
+                if not tmp < arr[sift - 1]:
+                    break
+            arr[sift] = tmp
+            yield WRITE, sift, tmp
+
+    def partial_insertion_sort(begin, end):
+        # PARTIAL_INSERTION_SORT_LIMIT 回移動したらあきらめる挿入ソート
+        limit = 0
+        for cur in range(begin + 1, end):
+            yield COMPARE, cur, cur - 1
+            if arr[cur] < arr[cur - 1]:
+                tmp = arr[cur]
+                sift = cur
+                while True:
+                    arr[sift] = arr[sift - 1]
+                    yield WRITE, sift, arr[sift]
+                    sift -= 1
+                    if sift == begin:
+                        break
+                    yield COMPARE, cur, sift - 1
+                    if not tmp < arr[sift - 1]:
+                        break
+                arr[sift] = tmp
+                yield WRITE, sift, tmp
+                limit += cur - sift
+            if limit > PARTIAL_INSERTION_SORT_LIMIT:
+                return False
+        return True
+
+    def heap_fallback(begin, end):
+        size = end - begin
+        for i in range((size - 2) // 2, -1, -1):
+            yield from heapify(size, i, begin)
         for i in range(size - 1, 0, -1):
-            set_swapping_indices([low, low + i])
-            swap(arr, low, low + i)
-            set_array(list(arr))
-            time.sleep(speed / 1000.0)
-            set_swapping_indices([])
-            heapify(arr, i, 0, low)
-
-    def insertion_sort_intro(arr, low, high):
-        for i in range(low + 1, high + 1):
-            key = arr[i]
-            j = i - 1
-            while j >= low and arr[j] > key:
-                if not is_sorting.current: return
-                set_comparing_indices([j, j + 1])
-                set_array(list(arr))
-                time.sleep(speed / 1000.0)
-                arr[j + 1] = arr[j]
-                j -= 1
-            arr[j + 1] = key
-            set_array(list(arr))
-            time.sleep(speed / 1000.0)
-
-    def intro_sort_recursive(arr, low, high, depth_limit):
-        if (high - low + 1) <= 16:  # Threshold for insertion sort
-            insertion_sort_intro(arr, low, high)
-            return
-
-        if depth_limit == 0:
-            heap_sort_intro(arr, low, high)
-            return
-
-        if low < high:
-            pi = partition(arr, low, high)
-            if pi is None: return  # Handle early exit
-
-            intro_sort_recursive(arr, low, pi - 1, depth_limit - 1)
-            intro_sort_recursive(arr, pi + 1, high, depth_limit - 1)
-
-    import math
-    intro_sort_recursive(array, 0, n - 1, math.floor(math.log2(n)) * MAX_DEPTH_FACTOR)
-
-    set_sorted_indices(list(range(n)))
-    set_comparing_indices([])
-
-import time
\ No newline at end of file
+            yield from swap(begin, begin + i)
+            yield from heapify(i, 0, begin)
+
+    def heapify(n_heap, i, offset):
+        # Floyd のボトムアップのふるい落とし: 穴を葉まで下ろしてから値を上へ戻す
+        value = arr[offset + i]
+        hole = i
+        child = 2 * hole + 1
+        while child < n_heap:
+            if child + 1 < n_heap:
+                yield COMPARE, offset + child, offset + child + 1
+                if arr[offset + child] < arr[offset + child + 1]:
+                    child += 1
+            arr[offset + hole] = arr[offset + child]
+            yield WRITE, offset + hole, arr[offset + hole]
+            hole = child
+            child = 2 * hole + 1
+
+        while hole > i:
+            parent = (hole - 1) // 2
+            yield COMPARE, offset + parent, offset + hole
+            if not arr[offset + parent] < value:
+                break
+            arr[offset + hole] = arr[offset + parent]
+            yield WRITE, offset + hole, arr[offset + hole]
+            hole = parent
+
+        arr[offset + hole] = value
+        yield WRITE, offset + hole, value
+
+    def fill_left(first, count, begin, pivot):
+        num = 0
+        for i in range(count):
+            offsets_l[num] = i
+            yield COMPARE, first + i, begin
+            if not arr[first + i] < pivot:
+                num += 1
+        return num
+
+    def fill_right(last, count, begin, pivot):
+        num = 0
+        for i in range(1, count + 1):
+            offsets_r[num] = i
+            yield COMPARE, last - i, begin
+            if arr[last - i] < pivot:
+                num += 1
+        return num
+
+    def partition_right(begin, end):
+        # ピボットと等しい要素は右へ。(ピボットの位置, 分割済みだったか) を返す
+        pivot = arr[begin]
+        first = begin + 1
+        last = end
+
+        # 3つの中央値なのでピボット以上の要素が必ずあり、この走査に範囲の確認はいらない
+        while True:
+            yield COMPARE, first, begin
+            if not arr[first] < pivot:
+                break
+            first += 1
+        if first - 1 == begin:
+            while first < last:
+                last -= 1
+                yield COMPARE, last, begin
+                if arr[last] < pivot:
+                    break
+        else:
+            while True:
+                last -= 1
+                yield COMPARE, last, begin
+                if arr[last] < pivot:
+                    break
+
+        already_partitioned = first >= last
+        if not already_partitioned:
+            yield from swap(first, last)
+            first += 1
+
+            # ブロック分割: 両側で位置の合わない要素のオフセットを集めてから、
+            # 組にして交換する
+            num_l = num_r = start_l = start_r = 0
+            while last - first > 2 * BLOCK_SIZE:
+                if num_l == 0:
+                    start_l = 0
+                    num_l = yield from fill_left(first, BLOCK_SIZE, begin, pivot)
+                if num_r == 0:
+                    start_r = 0
+                    num_r = yield from fill_right(last, BLOCK_SIZE, begin, pivot)
+                num = min(num_l, num_r)
+                for k in range(num):
+                    yield from swap(first + offsets_l[start_l + k], last - offsets_r[start_r + k])
+                num_l -= num
+                num_r -= num
+                start_l += num
+                start_r += num
+                if num_l == 0:
+                    first += BLOCK_SIZE
+                if num_r == 0:
+                    last -= BLOCK_SIZE
+
+            unknown_left = (last - first) - (BLOCK_SIZE if num_r or num_l else 0)
+            if num_r:
+                l_size, r_size = unknown_left, BLOCK_SIZE
+            elif num_l:
+                l_size, r_size = BLOCK_SIZE, unknown_left
+            else:
+                l_size = unknown_left // 2
+                r_size = unknown_left - l_size
+
+            if unknown_left and not num_l:
+                start_l = 0
+                num_l = yield from fill_left(first, l_size, begin, pivot)
+            if unknown_left and not num_r:
+                start_r = 0
+                num_r = yield from fill_right(last, r_size, begin, pivot)
+
+            num = min(num_l, num_r)
+            for k in range(num):
+                yield from swap(first + offsets_l[start_l + k], last - offsets_r[start_r + k])
+            num_l -= num
+            num_r -= num
+            start_l += num
+            start_r += num
+            if num_l == 0:
+                first += l_size
+            if num_r == 0:
+                last -= r_size
+
+            # 片側に位置の合わない要素が残っているので、境界の隣へ移す
+            if num_l:
+                while num_l:
+                    num_l -= 1
+                    last -= 1
+                    yield from swap(first + offsets_l[start_l + num_l], last)
+                first = last
+            if num_r:
+                while num_r:
+                    num_r -= 1
+                    yield from swap(last - offsets_r[start_r + num_r], first)
+                    first += 1
+                last = first
+
+        pivot_pos = first - 1
+        if pivot_pos != begin:
+            yield from swap(begin, pivot_pos)
+        return pivot_pos, already_partitioned
+
+    def partition_left(begin, end):
+        # ピボットと等しい要素は左へ。ピボットが前回と同じ値のときに使う
+        pivot = arr[begin]
+        first = begin
+        last = end
+
+        while True:
+            last -= 1
+            yield COMPARE, begin, last
+            if not pivot < arr[last]:
+                break
+        if last + 1 == end:
+            while first < last:
+                first += 1
+                yield COMPARE, begin, first
+                if pivot < arr[first]:
+                    break
+        else:
+            while True:
+                first += 1
+                yield COMPARE, begin, first
+                if pivot < arr[first]:
+                    break
+
+        while first < last:
+            yield from swap(first, last)
+            while True:
+                last -= 1
+                yield COMPARE, begin, last
+                if not pivot < arr[last]:
+                    break
+            while True:
+                first += 1
+                yield COMPARE, begin, first
+                if pivot < arr[first]:
+                    break
+
+        if last != begin:
+            yield from swap(begin, last)
+        return last
+
+    # 明示的な作業スタック: 小さい側を並べる間は大きい側がここで待つので、
+    # 待っている範囲は常に O(log n) 個まで
+    stack = [(0, n, log2_floor(n), True)] if n > 1 else []
+    while stack:
+        begin, end, bad_allowed, leftmost = stack.pop()
+        while True:
+            size = end - begin
+            if size < INSERTION_SORT_THRESHOLD:
+                yield from insertion_sort(begin, end, leftmost)
+                break
+
+            median_of, pivot_at = pivot_candidates(begin, end)
+            for a, b, c in median_of:
+                yield from sort3(a, b, c)
+            if pivot_at != begin:
+                yield from swap(begin, pivot_at)
+
+            # ここの要素はすべて arr[begin - 1] 以上。ピボットがそれと等しければ、
+            # ピボットと等しい要素を左にまとめて飛ばせる
+            if not leftmost:
+                yield COMPARE, begin - 1, begin
+                if not arr[begin - 1] < arr[begin]:
+                    begin = (yield from partition_left(begin, end)) + 1
+                    continue
+
+            pivot_pos, already_partitioned = yield from partition_right(begin, end)
+            l_size = pivot_pos - begin
+            r_size = end - (pivot_pos + 1)
+
+            if l_size < size // 8 or r_size < size // 8:
+                bad_allowed -= 1
+                if bad_allowed == 0:
+                    yield from heap_fallback(begin, end)
+                    break
+                # 非常に偏った分割: いくつかの要素を入れ替えてパターンを崩す
+                for i, j in pattern_breaking_swaps(begin, pivot_pos, end, l_size, r_size):
+                    yield from swap(i, j)
+            elif already_partitioned:
+                # 入力が整列済みに見えたので、安い挿入ソートで両側を仕上げてみる
+                left_done = yield from partial_insertion_sort(begin, pivot_pos)
+                if left_done:
+                    right_done = yield from partial_insertion_sort(pivot_pos + 1, end)
+                    if right_done:
+                        break
+
+            if l_size < r_size:
+                stack.append((pivot_pos + 1, end, bad_allowed, False))
+                end = pivot_pos
+            else:
+                stack.append((begin, pivot_pos, bad_allowed, leftmost))
+                begin = pivot_pos + 1
+                leftmost = False
+
+    yield MARK_SORTED, 0, n
+
+
+def pivot_candidates(begin, end):
+    # 3つの中央値（大きな範囲では Tukey の ninther）: その場で並べる3つ組と、
+    # 選んだピボットの位置（このあと begin と交換する）
+    size = end - begin
+    s2 = size // 2
+    if size > NINTHER_THRESHOLD:
+        return [
+            (begin, begin + s2, end - 1),
+            (begin + 1, begin + (s2 - 1), end - 2),
+            (begin + 2, begin + (s2 + 1), end - 3),
+            (begin + (s2 - 1), begin + s2, begin + (s2 + 1)),
+        ], begin + s2
+    return [(begin + s2, begin, end - 1)], begin
+
+
+def pattern_breaking_swaps(begin, pivot_pos, end, l_size, r_size):
+    # 非常に偏った分割の原因になったパターンを崩す交換
+    swaps = []
+    if l_size >= INSERTION_SORT_THRESHOLD:
+        swaps.append((begin, begin + l_size // 4))
+        swaps.append((pivot_pos - 1, pivot_pos - l_size // 4))
+        if l_size > NINTHER_THRESHOLD:
+            swaps.append((begin + 1, begin + (l_size // 4 + 1)))
+            swaps.append((begin + 2, begin + (l_size // 4 + 2)))
+            swaps.append((pivot_pos - 2, pivot_pos - (l_size // 4 + 1)))
+            swaps.append((pivot_pos - 3, pivot_pos - (l_size // 4 + 2)))
+    if r_size >= INSERTION_SORT_THRESHOLD:
+        swaps.append((pivot_pos + 1, pivot_pos + 1 + r_size // 4))
+        swaps.append((end - 1, end - r_size // 4))
+        if r_size > NINTHER_THRESHOLD:
+            swaps.append((pivot_pos + 2, pivot_pos + 2 + r_size // 4))
+            swaps.append((pivot_pos + 3, pivot_pos + 3 + r_size // 4))
+            swaps.append((end - 2, end - (1 + r_size // 4)))
+            swaps.append((end - 3, end - (2 + r_size // 4)))
+    return swaps
+
+
+def pdq_sort(arr, key=None, reverse=False):
+    # ステップイベントを出さない intro_sort_steps と同じアルゴリズム（ステップごとの割り当てがない）。
+    # 両者が同じ比較と移動をすることは tests/test_intro_sort.py で確かめている
+    if key is not None or reverse:
+        arr[:] = sort_by_key(pdq_sort, arr, key, reverse)
+        return arr
+    n = len(arr)
+    offsets_l = [0] * BLOCK_SIZE
+    offsets_r = [0] * BLOCK_SIZE
+
+    stack = [(0, n, log2_floor(n), True)] if n > 1 else []
+    while stack:
+        begin, end, bad_allowed, leftmost = stack.pop()
+        while True:
+            size = end - begin
+            if size < INSERTION_SORT_THRESHOLD:
+                _insertion_sort(arr, begin, end, leftmost)
+                break
+
+            median_of, pivot_at = pivot_candidates(begin, end)
+            for a, b, c in median_of:
+                _sort3(arr, a, b, c)
+            if pivot_at != begin:
+                arr[begin], arr[pivot_at] = arr[pivot_at], arr[begin]
+
+            if not leftmost and not arr[begin - 1] < arr[begin]:
+                begin = _partition_left(arr, begin, end) + 1
+                continue
+
+            pivot_pos, already_partitioned = _partition_right(arr, begin, end, offsets_l, offsets_r)
+            l_size = pivot_pos - begin
+            r_size = end - (pivot_pos + 1)
+
+            if l_size < size // 8 or r_size < size // 8:
+                bad_allowed -= 1
+                if bad_allowed == 0:
+                    heap_sort_range(arr, begin, end)
+                    break
+                for i, j in pattern_breaking_swaps(begin, pivot_pos, end, l_size, r_size):
+                    arr[i], arr[j] = arr[j], arr[i]
+            elif already_partitioned and _partial_insertion_sort(arr, begin, pivot_pos) \
+                    and _partial_insertion_sort(arr, pivot_pos + 1, end):
+                break
+
+            if l_size < r_size:
+                stack.append((pivot_pos + 1, end, bad_allowed, False))
+                end = pivot_pos
+            else:
+                stack.append((begin, pivot_pos, bad_allowed, leftmost))
+                begin = pivot_pos + 1
+                leftmost = False
+    return arr
+
+
+def _sort3(arr, a, b, c):
+    if arr[b] < arr[a]:
+        arr[a], arr[b] = arr[b], arr[a]
+    if arr[c] < arr[b]:
+        arr[b], arr[c] = arr[c], arr[b]
+    if arr[b] < arr[a]:
+        arr[a], arr[b] = arr[b], arr[a]
+
+
+def _insertion_sort(arr, begin, end, guarded):
+    for cur in range(begin + 1, end):
+        tmp = arr[cur]
+        if not tmp < arr[cur - 1]:
+            continue
+        sift = cur
+        while True:
+            arr[sift] = arr[sift - 1]
+            sift -= 1
+            if guarded and sift == begin:
+                break
+            if not tmp < arr[sift - 1]:
+                break
+        arr[sift] = tmp
+
+
+def _partial_insertion_sort(arr, begin, end):
+    limit = 0
+    for cur in range(begin + 1, end):
+        tmp = arr[cur]
+        if tmp < arr[cur - 1]:
+            sift = cur
+            while True:
+                arr[sift] = arr[sift - 1]
+                sift -= 1
+                if sift == begin or not tmp < arr[sift - 1]:
+                    break
+            arr[sift] = tmp
+            limit += cur - sift
+        if limit > PARTIAL_INSERTION_SORT_LIMIT:
+            return False
+    return True
+
+
+def _partition_right(arr, begin, end, offsets_l, offsets_r):
+    pivot = arr[begin]
+    first = begin + 1
+    last = end
+
+    while arr[first] < pivot:
+        first += 1
+    if first - 1 == begin:
+        while first < last:
+            last -= 1
+            if arr[last] < pivot:
+                break
+    else:
+        last -= 1
+        while not arr[last] < pivot:
+            last -= 1
+
+    already_partitioned = first >= last
+    if not already_partitioned:
+        arr[first], arr[last] = arr[last], arr[first]
+        first += 1
+
+        num_l = num_r = start_l = start_r = 0
+        while last - first > 2 * BLOCK_SIZE:
+            if num_l == 0:
+                start_l = 0
+                for i in range(BLOCK_SIZE):
+                    offsets_l[num_l] = i
+                    if not arr[first + i] < pivot:
+                        num_l += 1
+            if num_r == 0:
+                start_r = 0
+                for i in range(1, BLOCK_SIZE + 1):
+                    offsets_r[num_r] = i
+                    if arr[last - i] < pivot:
+                        num_r += 1
+            num = min(num_l, num_r)
+            for k in range(num):
+                a = first + offsets_l[start_l + k]
+                b = last - offsets_r[start_r + k]
+                arr[a], arr[b] = arr[b], arr[a]
+            num_l -= num
+            num_r -= num
+            start_l += num
+            start_r += num
+            if num_l == 0:
+                first += BLOCK_SIZE
+            if num_r == 0:
+                last -= BLOCK_SIZE
+
+        unknown_left = (last - first) - (BLOCK_SIZE if num_r or num_l else 0)
+        if num_r:
+            l_size, r_size = unknown_left, BLOCK_SIZE
+        elif num_l:
+            l_size, r_size = BLOCK_SIZE, unknown_left
+        else:
+            l_size = unknown_left // 2
+            r_size = unknown_left - l_size
+
+        if unknown_left and not num_l:
+            start_l = 0
+            for i in range(l_size):
+                offsets_l[num_l] = i
+                if not arr[first + i] < pivot:
+                    num_l += 1
+        if unknown_left and not num_r:
+            start_r = 0
+            for i in range(1, r_size + 1):
+                offsets_r[num_r] = i
+                if arr[last - i] < pivot:
+                    num_r += 1
+
+        num = min(num_l, num_r)
+        for k in range(num):
+            a = first + offsets_l[start_l + k]
+            b = last - offsets_r[start_r + k]
+            arr[a], arr[b] = arr[b], arr[a]
+        num_l -= num
+        num_r -= num
+        start_l += num
+        start_r += num
+        if num_l == 0:
+            first += l_size
+        if num_r == 0:
+            last -= r_size
+
+        if num_l:
+            while num_l:
+                num_l -= 1
+                last -= 1
+                a = first + offsets_l[start_l + num_l]
+                arr[a], arr[last] = arr[last], arr[a]
+            first = last
+        if num_r:
+            while num_r:
+                num_r -= 1
+                b = last - offsets_r[start_r + num_r]
+                arr[b], arr[first] = arr[first], arr[b]
+                first += 1
+            last = first
+
+    pivot_pos = first - 1
+    arr[begin] = arr[pivot_pos]
+    arr[pivot_pos] = pivot
+    return pivot_pos, already_partitioned
+
+
+def _partition_left(arr, begin, end):
+    pivot = arr[begin]
+    first = begin
+    last = end - 1
+
+    while pivot < arr[last]:
+        last -= 1
+    if last + 1 == end:
+        while first < last:
+            first += 1
+            if pivot < arr[first]:
+                break
+    else:
+        first += 1
+        while not pivot < arr[first]:
+            first += 1
+
+    while first < last:
+        arr[first], arr[last] = arr[last], arr[first]
+        last -= 1
+        while pivot < arr[last]:
+            last -= 1
+        first += 1
+        while not pivot < arr[first]:
+            first += 1
+
+    arr[begin] = arr[last]
+    arr[last] = pivot
+    return last
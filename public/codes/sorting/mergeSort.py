@@ -1,4 +1,14 @@
-def merge_sort(arr):
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from sortKeys import sort_by_key
+
+def merge_sort(arr, key=None, reverse=False):
+    if key is not None or reverse:
+        arr[:] = sort_by_key(merge_sort, arr, key, reverse)
+        return arr
     if len(arr) > 1:
         mid = len(arr) // 2
         L = arr[:mid]
@@ -22,4 +32,158 @@ def merge_sort(arr):
             arr[k] = R[j]
             j += 1
             k += 1
-    return arr
\ No newline at end of file
+    return arr
+
+PARALLEL_THRESHOLD = 50000
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+def merge_runs(src, dst, lo, mid, hi):
+    # src[lo:mid] と src[mid:hi] を dst[lo:hi] へ安定にマージする
+    merge_into(src, lo, mid, mid, hi, dst, lo)
+
+def merge_into(src, a_lo, a_hi, b_lo, b_hi, dst, out):
+    # src[a_lo:a_hi] と src[b_lo:b_hi] を dst の out から安定にマージする。
+    # リストでも型付きの memoryview でも動く
+    i, j, k = a_lo, b_lo, out
+    while i < a_hi and j < b_hi:
+        if src[j] < src[i]:
+            dst[k] = src[j]
+            j += 1
+        else:
+            dst[k] = src[i]
+            i += 1
+        k += 1
+    dst[k:k + a_hi - i] = src[i:a_hi]
+    k += a_hi - i
+    dst[k:k + b_hi - j] = src[j:b_hi]
+
+def merge_sort_buffered(arr, key=None, reverse=False):
+    if key is not None or reverse:
+        arr[:] = sort_by_key(merge_sort_buffered, arr, key, reverse)
+        return arr
+    return merge_passes(arr, list(arr))
+
+def merge_passes(arr, buffer):
+    # arr と同じ長さのバッファー1つとの間を往復するボトムアップのマージソート
+    n = len(arr)
+    src, dst = arr, buffer
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            merge_runs(src, dst, lo, mid, hi)
+        src, dst = dst, src
+        width *= 2
+    if src is not arr:
+        arr[:] = src
+    return arr
+
+_attached = {}
+
+def _attach(names):
+    for name in names:
+        _attached[name] = shared_memory.SharedMemory(name=name)
+
+def _sort_chunk(name, typecode, lo, hi):
+    # 共有メモリの区間をその場で並べる。複製は作業用のバッファー1つだけ
+    view = _attached[name].buf.cast(typecode)
+    chunk = view[lo:hi]
+    scratch = memoryview(array(typecode, chunk))
+    try:
+        merge_passes(chunk, scratch)
+    finally:
+        scratch.release()
+        chunk.release()
+        view.release()
+
+def _merge_segment(src_name, dst_name, typecode, a_lo, a_hi, b_lo, b_hi, out):
+    # どちらのランも複製せず、共有バッファーから別の共有バッファーへ直接マージする
+    src = _attached[src_name].buf.cast(typecode)
+    dst = _attached[dst_name].buf.cast(typecode)
+    try:
+        merge_into(src, a_lo, a_hi, b_lo, b_hi, dst, out)
+    finally:
+        src.release()
+        dst.release()
+
+def co_rank(k, src, a_lo, a_len, b_lo, b_len):
+    # マージ結果の先頭 k 個のうちラン A から来る個数（等しい値は A を優先）
+    lo = max(0, k - b_len)
+    hi = min(k, a_len)
+    while lo < hi:
+        i = (lo + hi) // 2
+        j = k - i
+        if j > 0 and not src[b_lo + j - 1] < src[a_lo + i]:
+            lo = i + 1
+        else:
+            hi = i
+    return lo
+
+def shared_typecode(values):
+    # すべての値を正確に保存し、同じ型で取り出せる共有バッファーの型コード。
+    # 値を Python のオブジェクトのまま扱う必要があれば None
+    if all(type(x) is int and INT64_MIN <= x <= INT64_MAX for x in values):
+        return "q"
+    if all(type(x) is float for x in values):
+        return "d"
+    return None
+
+def parallel_merge_sort(data, workers=None):
+    n = len(data)
+    workers = workers or os.cpu_count() or 1
+    typecode = shared_typecode(data) if workers > 1 and n >= PARALLEL_THRESHOLD else None
+    if typecode is None:
+        # 型の混在、bool、大きな整数、オブジェクトは元の要素のままマージする
+        return merge_sort_buffered(list(data))
+
+    size = n * array(typecode).itemsize
+    buffers = [shared_memory.SharedMemory(create=True, size=size) for _ in range(2)]
+    names = [shm.name for shm in buffers]
+    views = [shm.buf.cast(typecode) for shm in buffers]
+    try:
+        views[0][:n] = array(typecode, data)
+        bounds = [n * k // workers for k in range(workers + 1)]
+        runs = [(bounds[k], bounds[k + 1]) for k in range(workers) if bounds[k] < bounds[k + 1]]
+
+        with ProcessPoolExecutor(workers, initializer=_attach, initargs=(names,)) as pool:
+            # フェーズ1: 各ワーカーが共有メモリ上の自分の区間を並べる
+            list(pool.map(_sort_chunk, [names[0]] * len(runs), [typecode] * len(runs),
+                          [lo for lo, _ in runs], [hi for _, hi in runs]))
+
+            # フェーズ2: ランを2つずつマージする。各マージは独立した区間に分けて並列に行う
+            cur = 0
+            while len(runs) > 1:
+                src = views[cur]
+                pairs = [runs[k:k + 2] for k in range(0, len(runs), 2)]
+                segments = max(1, workers // len(pairs))
+                futures = []
+                for pair in pairs:
+                    a_lo, a_hi = pair[0]
+                    b_lo, b_hi = pair[1] if len(pair) == 2 else (a_hi, a_hi)
+                    a_len = a_hi - a_lo
+                    b_len = b_hi - b_lo
+                    total = a_len + b_len
+                    cuts = [total * s // segments for s in range(segments + 1)]
+                    ranks = [co_rank(k, src, a_lo, a_len, b_lo, b_len) for k in cuts]
+                    for s in range(segments):
+                        k0, k1 = cuts[s], cuts[s + 1]
+                        if k0 == k1:
+                            continue
+                        i0, i1 = ranks[s], ranks[s + 1]
+                        futures.append(pool.submit(
+                            _merge_segment, names[cur], names[1 - cur], typecode,
+                            a_lo + i0, a_lo + i1, b_lo + k0 - i0, b_lo + k1 - i1, a_lo + k0))
+                for future in futures:
+                    future.result()
+                runs = [(pair[0][0], pair[-1][1]) for pair in pairs]
+                cur = 1 - cur
+
+        return views[cur][:n].tolist()
+    finally:
+        for view in views:
+            view.release()
+        for shm in buffers:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,87 @@
+import heapq
+
+from quickSort import INSERTION_THRESHOLD, insertion_sort_range, select_pivot, three_way_partition
+
+# top_k は k が n のこの割合以下なら大きさを制限したヒープを、それ以外はクイックセレクトを使う
+# （heapq.nlargest は C で書かれた O(n log k)。浮動小数点数 100 万個では n / 4 程度まで速い）
+HEAP_FRACTION = 1 / 4
+
+def nth_element(arr, n, lo=0, hi=None):
+    # イントロセレクト: ninther をピボットにするクイックセレクト。悪い分割が多すぎたら
+    # O(n) が保証される中央値の中央値をピボットに切り替える
+    if hi is None:
+        hi = len(arr) - 1
+    if not lo <= n <= hi:
+        raise IndexError("nth_element index out of range")
+    budget = 2 * (hi - lo + 1).bit_length()
+    while hi - lo >= INSERTION_THRESHOLD:
+        if budget > 0:
+            pivot = arr[select_pivot(arr, lo, hi)]
+            budget -= 1
+        else:
+            pivot = arr[median_of_medians(arr, lo, hi)]
+        lt, gt = three_way_partition(arr, lo, hi, pivot)
+        if n < lt:
+            hi = lt - 1
+        elif n > gt:
+            lo = gt + 1
+        else:
+            return arr[n]
+    insertion_sort_range(arr, lo, hi)
+    return arr[n]
+
+def median_of_medians(arr, lo, hi):
+    # 5個ずつの組を並べ、各組の中央値を範囲の先頭に集めてから、
+    # それらの中央値を選ぶ
+    count = 0
+    for start in range(lo, hi + 1, 5):
+        end = min(start + 4, hi)
+        insertion_sort_range(arr, start, end)
+        mid = (start + end) // 2
+        arr[lo + count], arr[mid] = arr[mid], arr[lo + count]
+        count += 1
+    target = lo + (count - 1) // 2
+    nth_element(arr, target, lo, lo + count - 1)
+    return target
+
+def partial_sort(arr, k, lo=0, hi=None):
+    # arr[lo:hi + 1] の小さい方から k 個を順に先頭へ並べる: O(n + k log k)
+    if hi is None:
+        hi = len(arr) - 1
+    k = min(k, hi - lo + 1)
+    if k <= 0:
+        return arr
+    nth_element(arr, lo + k - 1, lo, hi)
+    head = arr[lo:lo + k - 1]
+    head.sort()
+    arr[lo:lo + k - 1] = head
+    return arr
+
+def top_k(items, k, key=None, largest=True):
+    # 大きい（または小さい）方から k 個を順に返す。heapq.nlargest と同じく、同じ値は元の順序を保つ
+    if k <= 0:
+        return []
+    if not isinstance(items, list):
+        # イテレーターは大きさを制限したヒープに流し込むしかない
+        return heapq.nlargest(k, items, key=key) if largest else heapq.nsmallest(k, items, key=key)
+    n = len(items)
+    if k >= n:
+        return sorted(items, key=key, reverse=largest)
+    if k <= n * HEAP_FRACTION:
+        return heapq.nlargest(k, items, key=key) if largest else heapq.nsmallest(k, items, key=key)
+
+    # 位置を添えるので、同じキーは順序を保ち、要素そのものは比較されない
+    if key is None:
+        decorated = [(x, -i) if largest else (x, i) for i, x in enumerate(items)]
+    else:
+        decorated = [(key(x), -i) if largest else (key(x), i) for i, x in enumerate(items)]
+    if largest:
+        nth_element(decorated, n - k)
+        chosen = decorated[n - k:]
+        chosen.sort()
+        chosen.reverse()
+    else:
+        nth_element(decorated, k - 1)
+        chosen = decorated[:k]
+        chosen.sort()
+    return [items[abs(i)] for _, i in chosen]
@@ -1,8 +1,122 @@
-def quick_sort(arr):
-    if len(arr) <= 1:
+from heapSort import heap_sort_range
+from sortKeys import sort_by_key
+
+INSERTION_THRESHOLD = 16
+NINTHER_THRESHOLD = 128
+DEPTH_FACTOR = 2  # ヒープソートに切り替えるまでに n の1ビットあたり許す分割の段数
+
+def quick_sort(arr, key=None, reverse=False):
+    # 並べ替えた新しいリストを返し、arr はそのまま残す
+    return quick_sort_inplace(list(arr), key, reverse)
+
+def quick_sort_inplace(arr, key=None, reverse=False):
+    if key is not None or reverse:
+        arr[:] = sort_by_key(quick_sort_inplace, arr, key, reverse)
         return arr
-    pivot = arr[len(arr) // 2]
-    left = [x for x in arr if x < pivot]
-    middle = [x for x in arr if x == pivot]
-    right = [x for x in arr if x > pivot]
-    return quick_sort(left) + middle + quick_sort(right)
\ No newline at end of file
+    # 明示的なスタックに待たせる範囲は O(log n) 個だけ。各範囲はまだ使える分割の深さを
+    # 持つので、悪意のある入力でも O(n log n) のヒープソートで終わる
+    stack = [(0, len(arr) - 1, DEPTH_FACTOR * len(arr).bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo >= INSERTION_THRESHOLD:
+            if depth == 0:
+                heap_sort_range(arr, lo, hi + 1)
+                break
+            depth -= 1
+            mid = (lo + hi) // 2
+            p1 = select_pivot(arr, lo, mid)
+            p2 = select_pivot(arr, mid + 1, hi)
+
+            if arr[p1] == arr[p2]:
+                # 2つのピボットが等しいなら重複が多い: 3分割1回でまとめて取り除く
+                lt, gt = three_way_partition(arr, lo, hi, arr[p1])
+                ranges = [(lo, lt - 1, depth), (gt + 1, hi, depth)]
+            else:
+                lt, gt = dual_pivot_partition(arr, lo, hi, p1, p2)
+                ranges = [(lo, lt - 1, depth), (lt + 1, gt - 1, depth), (gt + 1, hi, depth)]
+
+            # 大きい範囲を後回しにして、最も小さい範囲を続けて処理する
+            ranges.sort(key=lambda r: r[1] - r[0])
+            stack.extend(reversed(ranges[1:]))
+            lo, hi, depth = ranges[0]
+        else:
+            insertion_sort_range(arr, lo, hi)
+    return arr
+
+def median_of_three(arr, a, b, c):
+    if arr[a] < arr[b]:
+        if arr[b] < arr[c]: return b
+        elif arr[a] < arr[c]: return c
+        else: return a
+    else:
+        if arr[a] < arr[c]: return a
+        elif arr[b] < arr[c]: return c
+        else: return b
+
+def select_pivot(arr, lo, hi):
+    mid = (lo + hi) // 2
+    if hi - lo < NINTHER_THRESHOLD:
+        return median_of_three(arr, lo, mid, hi)
+    # Tukey の ninther: 等間隔に取った3つの3つ組の中央値の中央値
+    step = (hi - lo) // 8
+    return median_of_three(
+        arr,
+        median_of_three(arr, lo, lo + step, lo + 2 * step),
+        median_of_three(arr, mid - step, mid, mid + step),
+        median_of_three(arr, hi - 2 * step, hi - step, hi),
+    )
+
+def three_way_partition(arr, lo, hi, pivot):
+    # オランダ国旗問題: < pivot | == pivot | > pivot
+    lt, i, gt = lo, lo, hi
+    while i <= gt:
+        if arr[i] < pivot:
+            arr[lt], arr[i] = arr[i], arr[lt]
+            lt += 1
+            i += 1
+        elif pivot < arr[i]:
+            arr[i], arr[gt] = arr[gt], arr[i]
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+def dual_pivot_partition(arr, lo, hi, p1, p2):
+    # Yaroslavskiy の2ピボット分割: < P | P <= x < Q | >= Q。P と Q は最後に lt と gt に置かれる。
+    # p1 は p2 より左にあるので、P を lo に移しても Q は動かない
+    arr[lo], arr[p1] = arr[p1], arr[lo]
+    arr[hi], arr[p2] = arr[p2], arr[hi]
+    if arr[hi] < arr[lo]:
+        arr[lo], arr[hi] = arr[hi], arr[lo]
+    p, q = arr[lo], arr[hi]
+
+    lt = lo + 1
+    gt = hi - 1
+    k = lt
+    while k <= gt:
+        if arr[k] < p:
+            arr[k], arr[lt] = arr[lt], arr[k]
+            lt += 1
+        elif not arr[k] < q:
+            while q < arr[gt] and k < gt:
+                gt -= 1
+            arr[k], arr[gt] = arr[gt], arr[k]
+            gt -= 1
+            if arr[k] < p:
+                arr[k], arr[lt] = arr[lt], arr[k]
+                lt += 1
+        k += 1
+    lt -= 1
+    gt += 1
+    arr[lo], arr[lt] = arr[lt], arr[lo]
+    arr[hi], arr[gt] = arr[gt], arr[hi]
+    return lt, gt
+
+def insertion_sort_range(arr, lo, hi):
+    for i in range(lo + 1, hi + 1):
+        key = arr[i]
+        j = i - 1
+        while j >= lo and key < arr[j]:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = key
@@ -1,17 +1,26 @@
-def radix_sort(array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting):
+import struct
+
+from sortEvents import READ, WRITE, MARK_SORTED, run_visual
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def radix_sort(array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting, on_step=None):
+    run_visual(radix_sort_steps(array), array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting, on_step)
+
+
+def radix_sort_steps(array):
     n = len(array)
 
     if n == 0:
-        set_sorted_indices(list(range(n)))
-        set_comparing_indices([])
         return
 
     max_val = array[0]
     for i in range(1, n):
-        if not is_sorting.current: return
-        set_comparing_indices([i])
-        set_array(list(array))
-        time.sleep(speed / 1000.0)
+        yield READ, i, i
         if array[i] > max_val:
             max_val = array[i]
 
@@ -20,10 +29,7 @@ def radix_sort(array, set_array, set_comparing_indices, set_swapping_indices, se
         count = [0] * 10
 
         for i in range(n):
-            if not is_sorting.current: return
-            set_comparing_indices([i])
-            set_array(list(arr))
-            time.sleep(speed / 1000.0)
+            yield READ, i, i
             index = (arr[i] // exp) % 10
             count[index] += 1
 
@@ -32,28 +38,99 @@ def radix_sort(array, set_array, set_comparing_indices, set_swapping_indices, se
 
         i = n - 1
         while i >= 0:
-            if not is_sorting.current: return
-            set_comparing_indices([i])
-            set_array(list(arr))
-            time.sleep(speed / 1000.0)
+            yield READ, i, i
             index = (arr[i] // exp) % 10
             output[count[index] - 1] = arr[i]
             count[index] -= 1
             i -= 1
 
         for i in range(n):
-            if not is_sorting.current: return
             arr[i] = output[i]
-            set_array(list(arr))
-            set_sorted_indices(lambda prev: prev + [i])
-            time.sleep(speed / 1000.0)
+            yield WRITE, i, output[i]
+            yield MARK_SORTED, i, i + 1
 
     exp = 1
     while max_val // exp > 0:
-        counting_sort_for_radix(array, exp)
+        yield from counting_sort_for_radix(array, exp)
         exp *= 10
 
-    set_sorted_indices(list(range(n)))
-    set_comparing_indices([])
+    yield MARK_SORTED, 0, n
+
+
+RADIX_BITS = 8
+RADIX = 1 << RADIX_BITS
+SIGN_BIT = 1 << 63
+
+def float_key(x):
+    # IEEE 754 のビット列を、符号なし整数の順序が浮動小数点数の順序と一致するように反転する
+    bits = struct.unpack("<Q", struct.pack("<d", x))[0]
+    return bits ^ 0xFFFFFFFFFFFFFFFF if bits & SIGN_BIT else bits | SIGN_BIT
+
+def radix_sort_array(values, key=None, reverse=False):
+    if key is not None or reverse:
+        # レコードは数値のキーと一緒に同じ LSD のパスを通る
+        items = list(values)
+        keys = [key(x) for x in items] if key is not None else items
+        if reverse:
+            # 逆順の入力を昇順に並べてから結果を反転すると、同じキーの要素は順序を保つ
+            return radix_sort_records(keys[::-1], items[::-1])[::-1]
+        return radix_sort_records(keys, items)
+    if np is not None and isinstance(values, np.ndarray):
+        return _radix_sort_numpy(values)
+    return _radix_sort_list(list(values))
+
+def _radix_sort_numpy(values):
+    values = np.ascontiguousarray(values).ravel()
+    n = values.size
+    if n < 2:
+        return values.copy()
+
+    if values.dtype.kind == "f":
+        bits = values.astype(np.float64).view(np.uint64)
+        keys = np.where(bits >> np.uint64(63), ~bits, bits | np.uint64(SIGN_BIT))
+    elif values.dtype.kind == "u":
+        keys = values.astype(np.uint64)
+    elif values.dtype.kind in "ib":
+        keys = values.astype(np.int64).view(np.uint64) ^ np.uint64(SIGN_BIT)
+    else:
+        raise TypeError(f"radix_sort_array does not support dtype {values.dtype}")
+
+    order = np.arange(n)
+    for shift in range(0, 64, RADIX_BITS):
+        digits = ((keys >> np.uint64(shift)) & np.uint64(RADIX - 1)).astype(np.uint8)
+        # すべてのキーでこのバイトが同じなら、このパスで順序は変わらない
+        if np.bincount(digits, minlength=RADIX).max() == n:
+            continue
+        # uint8 に対する NumPy の安定ソートは計数ソートなので、各パスは O(n)
+        perm = np.argsort(digits, kind="stable")
+        keys = keys[perm]
+        order = order[perm]
+    return values[order]
+
+def _radix_sort_list(values):
+    return radix_sort_records(values, values)
+
+def radix_sort_records(keys, records):
+    # レコードを数値のキーで安定に LSD ソートする。レコードそのものは調べない
+    n = len(keys)
+    if n < 2:
+        return list(records)
+
+    if any(isinstance(x, float) for x in keys):
+        keys = [float_key(x) for x in keys]
+    else:
+        # 最小値を引くので負の値も扱え、パスの回数も減る
+        low = min(keys)
+        keys = [x - low for x in keys]
 
-import time
\ No newline at end of file
+    max_key = max(keys)
+    items = list(zip(keys, records))
+    shift = 0
+    while max_key >> shift:
+        buckets = [[] for _ in range(RADIX)]
+        for item in items:
+            buckets[(item[0] >> shift) & (RADIX - 1)].append(item)
+        if sum(1 for bucket in buckets if bucket) > 1:
+            items = [item for bucket in buckets for item in bucket]
+        shift += RADIX_BITS
+    return [value for _, value in items]
@@ -0,0 +1,175 @@
+import os
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from bucketSort import OVERSAMPLING, choose_boundaries
+from mergeSort import INT64_MAX, INT64_MIN, merge_sort_buffered
+from sortEvents import run_turbo
+from timSort import tim_sort_steps
+
+PARALLEL_THRESHOLD = 100000
+
+# 各バケットは (キー, 位置) の組として並べるので、同じキーは入力の順序を保つ
+LOCAL_SORTS = {
+    "timsort": lambda pairs: run_turbo(tim_sort_steps(pairs), count=False),
+    "merge": merge_sort_buffered,
+}
+
+_state = {}
+
+def _attach(names, typecode, splitters, local_sort):
+    _state["shm"] = [shared_memory.SharedMemory(name=name) for name in names]
+    _state["typecode"] = typecode
+    _state["splitters"] = splitters
+    _state["local_sort"] = local_sort
+
+def _views():
+    keys_in, keys_out, positions = _state["shm"]
+    typecode = _state["typecode"]
+    return keys_in.buf.cast(typecode), keys_out.buf.cast(typecode), positions.buf.cast("q")
+
+def _release(views):
+    for view in views:
+        view.release()
+
+def _count_chunk(lo, hi):
+    # フェーズ1: 入力の1区間の各バケットの大きさ
+    views = _views()
+    try:
+        splitters = _state["splitters"]
+        counts = [0] * (len(splitters) + 1)
+        for value in views[0][lo:hi].tolist():
+            counts[bisect_right(splitters, value)] += 1
+        return counts
+    finally:
+        _release(views)
+
+def _scatter_chunk(lo, hi, offsets):
+    # フェーズ2: 1区間を各バケットの自分の領域へ、入力の順序を保って写す
+    keys_in, keys_out, positions = views = _views()
+    try:
+        splitters = _state["splitters"]
+        keys = [[] for _ in offsets]
+        pos = [[] for _ in offsets]
+        for i, value in enumerate(keys_in[lo:hi].tolist(), lo):
+            b = bisect_right(splitters, value)
+            keys[b].append(value)
+            pos[b].append(i)
+        typecode = _state["typecode"]
+        for b, start in enumerate(offsets):
+            end = start + len(keys[b])
+            keys_out[start:end] = array(typecode, keys[b])
+            positions[start:end] = array("q", pos[b])
+    finally:
+        _release(views)
+
+def _sort_range(lo, hi):
+    # フェーズ3: 1つのバケットをその場で並べる
+    _, keys_out, positions = views = _views()
+    try:
+        pairs = list(zip(keys_out[lo:hi].tolist(), positions[lo:hi].tolist()))
+        LOCAL_SORTS[_state["local_sort"]](pairs)
+        keys_out[lo:hi] = array(_state["typecode"], [k for k, _ in pairs])
+        positions[lo:hi] = array("q", [i for _, i in pairs])
+    finally:
+        _release(views)
+
+def _sort_pairs(pairs, local_sort):
+    LOCAL_SORTS[local_sort](pairs)
+    return pairs
+
+def sample_sort_order(keys, workers=None, local_sort="timsort", oversampling=OVERSAMPLING):
+    # キーを安定に昇順に並べたときの位置
+    n = len(keys)
+    workers = workers or os.cpu_count() or 1
+    if local_sort not in LOCAL_SORTS:
+        raise ValueError(f"unknown local sort: {local_sort}")
+    if workers == 1 or n < PARALLEL_THRESHOLD:
+        pairs = list(zip(keys, range(n)))
+        LOCAL_SORTS[local_sort](pairs)
+        return [i for _, i in pairs]
+
+    splitters = choose_boundaries(keys, workers, oversampling)
+    typecode = _key_typecode(keys)
+    if typecode is None:
+        return _sample_sort_objects(keys, splitters, workers, local_sort)
+
+    size = n * array(typecode).itemsize
+    buffers = [shared_memory.SharedMemory(create=True, size=size) for _ in range(2)]
+    buffers.append(shared_memory.SharedMemory(create=True, size=n * array("q").itemsize))
+    names = [shm.name for shm in buffers]
+    keys_in = buffers[0].buf.cast(typecode)
+    positions = buffers[2].buf.cast("q")
+    try:
+        keys_in[:n] = array(typecode, keys)
+        bounds = [n * c // workers for c in range(workers + 1)]
+        chunks = [(bounds[c], bounds[c + 1]) for c in range(workers) if bounds[c] < bounds[c + 1]]
+        initargs = (names, typecode, splitters, local_sort)
+
+        with ProcessPoolExecutor(workers, initializer=_attach, initargs=initargs) as pool:
+            counts = list(pool.map(_count_chunk, *zip(*chunks)))
+
+            # 区間 c のバケット b は、それより小さいバケットすべてと、前の区間のバケット b の後から始まる
+            num_buckets = len(splitters) + 1
+            sizes = [sum(chunk_counts[b] for chunk_counts in counts) for b in range(num_buckets)]
+            starts = [0] * (num_buckets + 1)
+            for b in range(num_buckets):
+                starts[b + 1] = starts[b] + sizes[b]
+            offsets = []
+            running = starts[:num_buckets]
+            for chunk_counts in counts:
+                offsets.append(list(running))
+                running = [running[b] + chunk_counts[b] for b in range(num_buckets)]
+
+            list(pool.map(_scatter_chunk, [lo for lo, _ in chunks], [hi for _, hi in chunks], offsets))
+            ranges = [(starts[b], starts[b + 1]) for b in range(num_buckets) if sizes[b] > 1]
+            if ranges:
+                list(pool.map(_sort_range, *zip(*ranges)))
+
+        return positions[:n].tolist()
+    finally:
+        keys_in.release()
+        positions.release()
+        for shm in buffers:
+            shm.close()
+            shm.unlink()
+
+def _key_typecode(keys):
+    # 型付きのバッファーを使うのは、すべてのキーを Python と同じ順に並べられるときだけ
+    if all(isinstance(k, int) and INT64_MIN <= k <= INT64_MAX for k in keys):
+        return "q"
+    if all(isinstance(k, float) or (isinstance(k, int) and _exact_float(k)) for k in keys):
+        return "d"
+    return None
+
+def _exact_float(k):
+    # 大きな整数は変換で丸められ、近いキーの順序が入れ替わってしまう
+    try:
+        return float(k) == k
+    except OverflowError:
+        return False
+
+def _sample_sort_objects(keys, splitters, workers, local_sort):
+    # 型付きのバッファーに入らないキー（文字列、タプル）はここで振り分けて、
+    # バケットごとにワーカーへ送る
+    buckets = [[] for _ in range(len(splitters) + 1)]
+    for i, k in enumerate(keys):
+        buckets[bisect_right(splitters, k)].append((k, i))
+    with ProcessPoolExecutor(workers) as pool:
+        buckets = list(pool.map(_sort_pairs, buckets, [local_sort] * len(buckets)))
+    return [i for bucket in buckets for _, i in bucket]
+
+def parallel_sample_sort(data, workers=None, key=None, reverse=False, local_sort="timsort", oversampling=OVERSAMPLING):
+    # 安定: 同じキーの要素は reverse=True でも入力の順序を保つ
+    items = list(data)
+    keys = [key(x) for x in items] if key is not None else items
+    if reverse:
+        # 逆順の入力を昇順に並べてから結果を反転すると、同じキーの要素は順序を保つ
+        keys = keys[::-1]
+    order = sample_sort_order(keys, workers, local_sort, oversampling)
+    if reverse:
+        last = len(items) - 1
+        return [items[last - i] for i in reversed(order)]
+    return [items[i] for i in order]
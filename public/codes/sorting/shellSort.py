@@ -1,29 +1,185 @@
-def shell_sort(array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting):
+import math
+import random
+
+from sortEvents import COMPARE, WRITE, MARK_SORTED, run_visual
+from sortKeys import sort_by_key
+
+CIURA_GAPS = [1, 4, 10, 23, 57, 132, 301, 701, 1750]
+
+
+def shell_sort(array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting, on_step=None, gaps="shell"):
+    run_visual(shell_sort_steps(array, gaps), array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting, on_step)
+
+
+def shell_sort_steps(array, gaps="shell"):
     n = len(array)
 
-    gap = n // 2
-    while gap > 0:
+    for gap in gap_sequence(gaps, n):
         for i in range(gap, n):
             temp = array[i]
             j = i
             while j >= gap and array[j - gap] > temp:
-                if not is_sorting.current: return
-                set_comparing_indices([j, j - gap])
-                set_array(list(array))
-                time.sleep(speed / 1000.0)
-
-                set_swapping_indices([j, j - gap])
+                yield COMPARE, j, j - gap
                 array[j] = array[j - gap]
-                set_array(list(array))
-                time.sleep(speed / 1000.0)
-                set_swapping_indices([])
+                yield WRITE, j, array[j]
                 j -= gap
             array[j] = temp
-            set_array(list(array))
-            time.sleep(speed / 1000.0)
+            yield WRITE, j, temp
+
+    yield MARK_SORTED, 0, n
+
+
+def shell_sort_fast(arr, gaps="ciura", key=None, reverse=False):
+    # ステップイベントを出さない同じアルゴリズム（可視化しないとき用）
+    if key is not None or reverse:
+        arr[:] = sort_by_key(lambda a: shell_sort_fast(a, gaps=gaps), arr, key, reverse)
+        return arr
+    n = len(arr)
+    for gap in gap_sequence(gaps, n):
+        for i in range(gap, n):
+            temp = arr[i]
+            j = i
+            while j >= gap and arr[j - gap] > temp:
+                arr[j] = arr[j - gap]
+                j -= gap
+            if j != i:
+                arr[j] = temp
+    return arr
+
+
+# 間隔列: どれも n を受け取り、1 から始まる n 未満の間隔を昇順で返す
+
+def shell_gaps(n):
+    gaps = []
+    gap = n // 2
+    while gap > 0:
+        gaps.append(gap)
         gap //= 2
+    return gaps[::-1]
+
+
+def ciura_gaps(n):
+    # 実験で求めた数列。1750 より先は慣例どおり 2.25 倍して延ばす
+    gaps = [g for g in CIURA_GAPS if g < n]
+    gap = CIURA_GAPS[-1]
+    while True:
+        gap = int(gap * 2.25)
+        if gap >= n:
+            break
+        gaps.append(gap)
+    return gaps or [1]
+
+
+def tokuda_gaps(n):
+    gaps = []
+    k = 0
+    while True:
+        gap = math.ceil((9 * (9 / 4) ** k - 4) / 5)
+        if gap >= n and gaps:
+            break
+        gaps.append(gap)
+        k += 1
+    return gaps
+
+
+def sedgewick_gaps(n):
+    # 1 に続けて 4^k + 3 * 2^(k - 1) + 1
+    gaps = [1]
+    k = 1
+    while True:
+        gap = 4 ** k + 3 * 2 ** (k - 1) + 1
+        if gap >= n:
+            break
+        gaps.append(gap)
+        k += 1
+    return gaps
+
+
+def pratt_gaps(n):
+    # n 未満のすべての 3-平滑数 2^p * 3^q
+    gaps = []
+    power_of_two = 1
+    while power_of_two < max(n, 2):
+        gap = power_of_two
+        while gap < max(n, 2):
+            gaps.append(gap)
+            gap *= 3
+        power_of_two *= 2
+    return sorted(gaps)
+
+
+GAP_SEQUENCES = {
+    "shell": shell_gaps,
+    "ciura": ciura_gaps,
+    "tokuda": tokuda_gaps,
+    "sedgewick": sedgewick_gaps,
+    "pratt": pratt_gaps,
+}
+
+
+def register_gap_sequence(name, fn):
+    GAP_SEQUENCES[name] = fn
+
+
+def gap_sequence(gaps, n):
+    # 大きい間隔から順に使う。gaps は登録済みの名前、n の関数、間隔のリストのどれでもよい。
+    # 間隔 1 は必ず含める（最後の挿入ソートのパスが整列を保証する）
+    if isinstance(gaps, str):
+        if gaps not in GAP_SEQUENCES:
+            raise ValueError(f"unknown gap sequence: {gaps}")
+        gaps = GAP_SEQUENCES[gaps]
+    if callable(gaps):
+        gaps = gaps(n)
+    return sorted((g for g in set(gaps) | {1} if 0 < g < max(n, 2)), reverse=True)
+
+
+def count_operations(arr, gaps):
+    comparisons = 0
+    moves = 0
+    n = len(arr)
+    for gap in gap_sequence(gaps, n):
+        for i in range(gap, n):
+            temp = arr[i]
+            j = i
+            while j >= gap:
+                comparisons += 1
+                if not arr[j - gap] > temp:
+                    break
+                arr[j] = arr[j - gap]
+                moves += 1
+                j -= gap
+            if j != i:
+                arr[j] = temp
+                moves += 1
+    return comparisons, moves
+
+
+def benchmark_gap_sequences(sizes, trials=5, sequences=None, seed=0):
+    # 無作為な順列での、間隔列ごとの比較と移動の平均回数
+    rng = random.Random(seed)
+    results = []
+    for n in sizes:
+        inputs = []
+        for _ in range(trials):
+            data = list(range(n))
+            rng.shuffle(data)
+            inputs.append(data)
+        for name in sequences or GAP_SEQUENCES:
+            comparisons = 0
+            moves = 0
+            for data in inputs:
+                c, m = count_operations(list(data), name)
+                comparisons += c
+                moves += m
+            results.append({
+                "sequence": name,
+                "size": n,
+                "comparisons": comparisons / trials,
+                "moves": moves / trials,
+            })
+    return results
 
-    set_sorted_indices(list(range(n)))
-    set_comparing_indices([])
 
-import time
\ No newline at end of file
+if __name__ == "__main__":
+    for row in benchmark_gap_sequences([100, 1000, 10000], trials=3):
+        print(f"{row['sequence']:>10} n={row['size']:>6}  comparisons={row['comparisons']:>12.1f}  moves={row['moves']:>12.1f}")
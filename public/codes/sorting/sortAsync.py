@@ -0,0 +1,165 @@
+# asyncio でのソート再生 (Async Sort Runner)
+# time.sleep でスレッドを止める代わりに、1つのイベントループ上で多数のソートを
+# 協調的に進める。各セッションはフレームごとに進めるべきステップをまとめて適用し、
+# await asyncio.sleep で次のフレームまで制御を返す
+#
+#   manager = SessionManager()
+#   session = manager.start("tim_sort", array, render, speed=5)
+#   session.speed = 1        # 実行中に速さを変える
+#   session.cancel()         # 中断（ステップ生成器も閉じられる）
+#   await manager.wait()
+
+import asyncio
+import inspect
+import itertools
+
+from sortScheduler import DEFAULT_FPS, FrameScheduler, sort_steps
+
+# 1回の進行で適用するステップの上限。これを超える分は次の機会に回し、他のセッションに制御を譲る
+MAX_STEPS_PER_TICK = 2048
+
+
+class SortSession:
+    """イベントループ上で1つのソートを再生するセッション"""
+
+    def __init__(self, session_id, steps, array, render, speed, fps):
+        self.id = session_id
+        self.array = array
+        self.render = render
+        self.speed = speed  # 1ステップあたりのミリ秒。0 以下なら待たずに進める
+        self.fps = fps
+        self.scheduler = FrameScheduler(steps, array, fps)
+        self.task = None
+
+    @property
+    def done(self):
+        return self.scheduler.done
+
+    @property
+    def steps(self):
+        return self.scheduler.step_count
+
+    async def run(self):
+        """
+        ソートが終わるまでフレームを送り続ける
+
+        Returns:
+            bool: 最後まで再生したら True、render が False を返して中断したら False
+        """
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.fps
+        budget = 0.0
+        last = loop.time()
+        try:
+            while not self.scheduler.done:
+                await asyncio.sleep(0 if self.speed <= 0 else interval)
+                # 待っている間に速さが変わっているかもしれないので、起きてから読み直す
+                speed = self.speed
+                now = loop.time()
+                if speed <= 0:
+                    count = MAX_STEPS_PER_TICK
+                else:
+                    budget += (now - last) * 1000.0 / speed
+                    count = min(int(budget), MAX_STEPS_PER_TICK)
+                    budget -= count
+                last = now
+                if not count:
+                    continue
+
+                result = self.render(self.scheduler.advance(count))
+                if inspect.isawaitable(result):
+                    result = await result
+                if result is False:
+                    return False
+            return True
+        finally:
+            self.scheduler.close()
+
+    def cancel(self):
+        """再生を中断する"""
+        if self.task is not None:
+            self.task.cancel()
+        else:
+            self.scheduler.close()
+
+
+class SessionManager:
+    """1つのイベントループで多数のソートセッションを同時に実行する"""
+
+    def __init__(self, fps=DEFAULT_FPS):
+        self.fps = fps
+        self.sessions = {}
+        self._ids = itertools.count(1)
+
+    def start(self, name, array, render, speed=0, fps=None):
+        """
+        ソートを始める（実行中のイベントループの中から呼ぶ）
+
+        Args:
+            name (str): sortScheduler.STEP_SORTS のキー
+            array (list): 並べ替える配列（その場で並べ替えられる）
+            render: Frame を受け取る関数またはコルーチン関数。False を返すと中断
+            speed (float): 1ステップあたりのミリ秒
+            fps (int): このセッションのフレームレート（省略時はマネージャーの値）
+
+        Returns:
+            SortSession: 開始したセッション
+        """
+        session = SortSession(next(self._ids), sort_steps(name, array), array, render, speed, fps or self.fps)
+        session.task = asyncio.get_running_loop().create_task(session.run())
+        session.task.add_done_callback(lambda _: self.sessions.pop(session.id, None))
+        self.sessions[session.id] = session
+        return session
+
+    def set_speed(self, session_id, speed):
+        """実行中のセッションの速さを変える"""
+        self.sessions[session_id].speed = speed
+
+    def cancel(self, session_id):
+        """セッションを中断する（終了済みなら何もしない）"""
+        session = self.sessions.get(session_id)
+        if session is not None:
+            session.cancel()
+
+    def cancel_all(self):
+        """すべてのセッションを中断する"""
+        for session in list(self.sessions.values()):
+            session.cancel()
+
+    async def wait(self):
+        """実行中のすべてのセッションが終わるまで待つ（中断されたものも含む）"""
+        tasks = [session.task for session in list(self.sessions.values())]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def run_async(steps, array, render, speed=0, fps=DEFAULT_FPS):
+    """
+    ステップ生成器を1つだけ再生する（SessionManager を使わない簡易版）
+
+    Returns:
+        bool: 最後まで再生したら True
+    """
+    return await SortSession(0, steps, array, render, speed, fps).run()
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    async def main():
+        manager = SessionManager()
+        finished = []
+
+        def render(frame):
+            if frame.done:
+                finished.append(frame.array == sorted(frame.array))
+
+        start = time.perf_counter()
+        for i in range(300):
+            array = [random.randrange(1000) for _ in range(200)]
+            manager.start(["tim_sort", "intro_sort", "shell_sort"][i % 3], array, render, speed=0.05)
+        await manager.wait()
+        print(f"{len(finished)} sessions sorted in {time.perf_counter() - start:.2f}s, all correct: {all(finished)}")
+
+    asyncio.run(main())
@@ -0,0 +1,244 @@
+# ソートのベンチマーク (Sort Benchmark)
+# 各ソートを「サイズ × 入力の形」の組み合わせで実行し、結果を JSON / CSV で出力する
+#
+#   python sortBenchmark.py --sizes 100 1000 --json result.json --csv result.csv
+#   python sortBenchmark.py --baseline result.json   # 前回より遅くなった組み合わせを報告
+
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from sortEvents import run_turbo
+from sortInstrument import instrument
+import bubbleSort
+import bucketSort
+import countingSort
+import heapSort
+import insertionSort
+import introSort
+import mergeSort
+import quickSort
+import radixSort
+import selectionSort
+import shellSort
+import timSort
+
+# kind: "inplace" は引数を並べ替えて返す、"steps" はステップ生成器、"returns" は新しいリストを返す
+SORTS = {
+    "bubble_sort": (bubbleSort.bubble_sort, "inplace"),
+    "selection_sort": (selectionSort.selection_sort, "inplace"),
+    "insertion_sort": (insertionSort.insertion_sort, "inplace"),
+    "merge_sort": (mergeSort.merge_sort, "inplace"),
+    "merge_sort_buffered": (mergeSort.merge_sort_buffered, "inplace"),
+    "quick_sort": (quickSort.quick_sort_inplace, "inplace"),
+    "heap_sort": (heapSort.heap_sort, "inplace"),
+    "tim_sort": (timSort.tim_sort_steps, "steps"),
+    "intro_sort": (introSort.intro_sort_steps, "steps"),
+    "pdq_sort": (introSort.pdq_sort, "inplace"),
+    "shell_sort": (shellSort.shell_sort_steps, "steps"),
+    "shell_sort_fast": (shellSort.shell_sort_fast, "inplace"),
+    "radix_sort": (radixSort.radix_sort_steps, "steps"),
+    "counting_sort": (countingSort.counting_sort_steps, "steps"),
+    "bucket_sort": (bucketSort.bucket_sort_steps, "steps"),
+    "radix_sort_array": (radixSort.radix_sort_array, "returns"),
+    "counting_sort_array": (countingSort.counting_sort_array, "returns"),
+    "sample_bucket_sort": (bucketSort.sample_bucket_sort, "returns"),
+}
+
+# O(n²) のソートはこのサイズを超えると省略する
+QUADRATIC = {"bubble_sort", "selection_sort", "insertion_sort"}
+DEFAULT_QUADRATIC_LIMIT = 2000
+
+# 数値演算で並べるソートは要素を包めないので、--instrument でも比較回数は数えない
+NUMERIC = {"radix_sort", "counting_sort", "bucket_sort", "radix_sort_array", "counting_sort_array", "sample_bucket_sort"}
+
+# これより短い実行時間は誤差が大きいので、時間の悪化判定に使わない
+MIN_COMPARABLE_SECONDS = 0.001
+
+SHAPES = ["random", "sorted", "reversed", "few_unique", "organ_pipe", "nearly_sorted"]
+
+CSV_FIELDS = ["sort", "shape", "size", "seconds", "comparisons", "swaps", "writes", "peak_bytes", "max_depth", "correct"]
+
+
+def make_input(shape, size, rng):
+    """入力の形に応じた非負整数の配列を作る"""
+    if shape == "random":
+        return [rng.randrange(size * 4 + 1) for _ in range(size)]
+    if shape == "sorted":
+        return list(range(size))
+    if shape == "reversed":
+        return list(range(size, 0, -1))
+    if shape == "few_unique":
+        return [rng.randrange(8) for _ in range(size)]
+    if shape == "organ_pipe":
+        half = size // 2
+        return list(range(half)) + list(range(size - half, 0, -1))
+    if shape == "nearly_sorted":
+        data = list(range(size))
+        for _ in range(size // 100 + 1 if size else 0):
+            i = rng.randrange(size)
+            j = rng.randrange(size)
+            data[i], data[j] = data[j], data[i]
+        return data
+    raise ValueError(f"unknown shape: {shape}")
+
+
+def run_once(fn, kind, data):
+    """1回実行して (結果, 操作回数) を返す"""
+    if kind == "steps":
+        return data, run_turbo(fn(data))
+    if kind == "inplace":
+        fn(data)
+        return data, None
+    return fn(data), None
+
+
+def measure(name, data, repeat=3, instrumented=False):
+    """
+    1つの組み合わせを計測する
+
+    instrumented が True なら、ステップを出さないソートの操作回数と
+    最大呼び出し深さも sortInstrument で数える（時間とは別の実行で）
+    """
+    fn, kind = SORTS[name]
+    expected = sorted(data)
+
+    best = None
+    for _ in range(repeat):
+        trial = list(data)
+        start = time.perf_counter()
+        result, counts = run_once(fn, kind, trial)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    # tracemalloc は実行を遅くするので、時間とは別の実行でメモリを測る
+    tracemalloc.start()
+    try:
+        run_once(fn, kind, list(data))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    row = {
+        "sort": name,
+        "seconds": best,
+        "comparisons": counts["compare"] if counts else None,
+        "swaps": counts["swap"] if counts else None,
+        "writes": counts["write"] if counts else None,
+        "peak_bytes": peak,
+        "max_depth": None,
+        "correct": list(result) == expected,
+    }
+    if instrumented:
+        report = instrument(fn, data, kind, wrap_elements=name not in NUMERIC)
+        row["max_depth"] = report["max_depth"]
+        if counts is None:
+            for field in ("comparisons", "swaps", "writes"):
+                row[field] = report[field]
+    return row
+
+
+def run_benchmark(sorts=None, sizes=(100, 1000), shapes=None, repeat=3, seed=0,
+                  quadratic_limit=DEFAULT_QUADRATIC_LIMIT, instrumented=False):
+    """
+    ベンチマークを実行する
+
+    Returns:
+        list: 組み合わせごとの結果（辞書）のリスト
+    """
+    rng = random.Random(seed)
+    results = []
+    for size in sizes:
+        for shape in shapes or SHAPES:
+            data = make_input(shape, size, rng)
+            for name in sorts or SORTS:
+                if name in QUADRATIC and size > quadratic_limit:
+                    continue
+                row = measure(name, data, repeat, instrumented)
+                row["shape"] = shape
+                row["size"] = size
+                results.append(row)
+    return results
+
+
+def find_regressions(results, baseline, tolerance=0.2):
+    """
+    ベースラインと比べて悪化した組み合わせを返す
+
+    実行時間は tolerance の割合まで、操作回数は増えた時点で悪化とみなす
+    """
+    previous = {(row["sort"], row["shape"], row["size"]): row for row in baseline}
+    regressions = []
+    for row in results:
+        old = previous.get((row["sort"], row["shape"], row["size"]))
+        if old is None:
+            continue
+        reasons = []
+        if not row["correct"]:
+            reasons.append("incorrect result")
+        if row["seconds"] >= MIN_COMPARABLE_SECONDS and row["seconds"] > old["seconds"] * (1 + tolerance):
+            reasons.append(f"seconds {old['seconds']:.6f} -> {row['seconds']:.6f}")
+        for field in ("comparisons", "swaps", "writes"):
+            if old.get(field) is not None and row.get(field) is not None and row[field] > old[field]:
+                reasons.append(f"{field} {old[field]} -> {row[field]}")
+        if reasons:
+            regressions.append({"sort": row["sort"], "shape": row["shape"], "size": row["size"], "reasons": reasons})
+    return regressions
+
+
+def write_csv(results, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for row in results:
+            writer.writerow({field: row.get(field) for field in CSV_FIELDS})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the sorting algorithms")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES)
+    parser.add_argument("--sorts", nargs="+", choices=sorted(SORTS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quadratic-limit", type=int, default=DEFAULT_QUADRATIC_LIMIT)
+    parser.add_argument("--instrument", action="store_true",
+                        help="count operations of every sort (slower, separate run)")
+    parser.add_argument("--json", help="write results as JSON")
+    parser.add_argument("--csv", help="write results as CSV")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.sorts, args.sizes, args.shapes, args.repeat, args.seed, args.quadratic_limit,
+                            args.instrument)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.csv:
+        write_csv(results, args.csv)
+    if not args.json and not args.csv:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    failed = [row for row in results if not row["correct"]]
+    for row in failed:
+        print(f"INCORRECT: {row['sort']} {row['shape']} {row['size']}", file=sys.stderr)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        for item in regressions:
+            print(f"REGRESSION: {item['sort']} {item['shape']} {item['size']}: {'; '.join(item['reasons'])}", file=sys.stderr)
+
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+# ソートのステップイベント (Sort Step Events)
+# 可視化ソートは配列全体のコピーではなく、差分イベントを順に生成する
+#
+#   (COMPARE, i, j)          i と j を比較
+#   (READ, i, i)             i を単独で読み取った（最大値の探索や振り分けなど）
+#   (SWAP, i, j)             i と j を交換した
+#   (WRITE, i, value)        i に value を書き込んだ
+#   (MARK_SORTED, lo, hi)    range(lo, hi) が確定した
+#
+# イベントは配列を書き換えた「後」に生成されるので、受け取った側は
+# 必要なときだけフレーム（配列全体）を組み立てればよい。
+# 各ステップ生成器は最後に (MARK_SORTED, 0, n) を生成して完了を知らせる
+
+import time
+from collections import deque
+
+COMPARE = 0
+SWAP = 1
+WRITE = 2
+MARK_SORTED = 3
+READ = 4
+
+OP_NAMES = ("compare", "swap", "write", "mark_sorted", "read")
+
+
+class FrameAdapter:
+    """差分イベントを適用し、要求されたときだけフレームを再構築する"""
+
+    def __init__(self, array):
+        self.array = list(array)  # 初期配列の複製（以後は差分だけで更新）
+        self.comparing = []
+        self.swapping = []
+        self.sorted_ranges = []
+        self.steps = 0
+
+    def __call__(self, op, a, b):
+        self.apply(op, a, b)
+
+    def apply(self, op, a, b):
+        """イベントを1つ適用する - O(1)"""
+        self.steps += 1
+        if op == COMPARE:
+            self.comparing = [a, b]
+            self.swapping = []
+        elif op == READ:
+            self.comparing = [a]
+            self.swapping = []
+        elif op == SWAP:
+            self.array[a], self.array[b] = self.array[b], self.array[a]
+            self.swapping = [a, b]
+        elif op == WRITE:
+            self.array[a] = b
+            self.swapping = []
+        elif op == MARK_SORTED:
+            self.sorted_ranges.append((a, b))
+
+    def frame(self):
+        """現在の配列全体を返す - O(n)"""
+        return list(self.array)
+
+    def sorted_indices(self):
+        """確定済みインデックスの一覧を返す"""
+        indices = set()
+        for lo, hi in self.sorted_ranges:
+            indices.update(range(lo, hi))
+        return sorted(indices)
+
+
+def run_visual(steps, array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting, on_step=None):
+    """
+    ステップ生成器を可視化用コールバックで再生する
+
+    on_step を渡すと差分イベントをそのまま転送し、配列全体のコピーは行わない。
+    渡さない場合は従来どおり set_array(list(array)) でフレームを送る。
+    """
+    n = len(array)
+    delay = speed / 1000.0
+
+    for op, a, b in steps:
+        if not is_sorting.current: return
+        if on_step is not None:
+            on_step(op, a, b)
+            if op != MARK_SORTED:
+                time.sleep(delay)
+        elif op == COMPARE or op == READ:
+            set_comparing_indices([a] if op == READ else [a, b])
+            set_array(list(array))
+            time.sleep(delay)
+        elif op == SWAP:
+            set_swapping_indices([a, b])
+            set_array(list(array))
+            time.sleep(delay)
+            set_swapping_indices([])
+        elif op == WRITE:
+            set_array(list(array))
+            time.sleep(delay)
+        else:
+            set_sorted_indices(lambda prev, lo=a, hi=b: prev + list(range(lo, hi)))
+
+    set_sorted_indices(list(range(n)))
+    set_comparing_indices([])
+
+
+def run_turbo(steps, count=True):
+    """
+    ステップ生成器を待機・コールバック・中断確認なしで最後まで実行する（ターボモード）
+
+    Args:
+        steps: tim_sort_steps(array) などのステップ生成器
+        count (bool): False なら回数を数えずに最速で消費する
+
+    Returns:
+        dict: 操作ごとの回数と総ステップ数（count=False の場合は None）
+    """
+    if not count:
+        deque(steps, maxlen=0)
+        return None
+
+    counts = [0] * len(OP_NAMES)
+    for op, _, _ in steps:
+        counts[op] += 1
+
+    report = dict(zip(OP_NAMES, counts))
+    report["steps"] = sum(counts)
+    return report
@@ -0,0 +1,225 @@
+# 操作回数の計測 (Sort Instrumentation)
+# 要素を比較回数を数えるラッパーで包み、配列を書き込み回数を数えるリストに置き換えて
+# ソートを1回実行し、比較・交換・書き込み・補助メモリ・最大呼び出し深さを報告する
+#
+# ソート関数そのものには手を入れないので、計測しないときのコストはゼロ
+#
+#   report = instrument(heap_sort, data)
+#   print(report["comparisons"], report["swaps"], report["max_depth"])
+
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+REPORT_FIELDS = ["comparisons", "swaps", "writes", "aux_bytes", "max_depth", "seconds"]
+
+
+class Counters:
+    __slots__ = ("comparisons", "swaps", "writes")
+
+    def __init__(self):
+        self.comparisons = 0
+        self.swaps = 0
+        self.writes = 0
+
+
+class CountedItem:
+    """比較されるたびにカウンタを1つ増やす要素のラッパー"""
+    __slots__ = ("value", "counters")
+
+    def __init__(self, value, counters):
+        self.value = value
+        self.counters = counters
+
+    def __lt__(self, other):
+        self.counters.comparisons += 1
+        return self.value < other.value
+
+    def __le__(self, other):
+        self.counters.comparisons += 1
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        self.counters.comparisons += 1
+        return self.value > other.value
+
+    def __ge__(self, other):
+        self.counters.comparisons += 1
+        return self.value >= other.value
+
+    def __eq__(self, other):
+        self.counters.comparisons += 1
+        return self.value == other.value
+
+    def __ne__(self, other):
+        self.counters.comparisons += 1
+        return self.value != other.value
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __repr__(self):
+        return f"CountedItem({self.value!r})"
+
+
+class CountingList(list):
+    """
+    書き込み回数を数えるリスト
+
+    a[i], a[j] = a[j], a[i] のように2つの要素を入れ替える連続した書き込みは、
+    書き込み2回ではなく交換1回として数える（sortEvents の SWAP と同じ扱い）。
+    交換かどうかは値の同一性ではなく、読み取りと書き込みのインデックスの対応で判定するので、
+    小さな整数のように同じオブジェクトを共有する値でも誤判定しない
+    """
+
+    def __init__(self, items, counters):
+        super().__init__(items)
+        self.counters = counters
+        self._reads = (None, None)  # 直前の2回の読み取りのインデックス
+        self._partner = None        # 交換の後半として書き込まれるはずのインデックス
+
+    def __getitem__(self, index):
+        # スライスで作った一時リスト（merge_sort の L, R など）への書き込みも数える
+        if isinstance(index, slice):
+            return CountingList(list.__getitem__(self, index), self.counters)
+        value = list.__getitem__(self, index)
+        self._reads = (self._reads[1], index % len(self))
+        self._partner = None
+        return value
+
+    def __setitem__(self, index, value):
+        counters = self.counters
+        if isinstance(index, slice):
+            old = list.__getitem__(self, index)
+            list.__setitem__(self, index, value)
+            counters.writes += len(old)
+            self._reads = (None, None)
+            self._partner = None
+            return
+
+        list.__setitem__(self, index, value)
+        index %= len(self)
+        if self._partner == index:
+            # a[j], a[i] を読んで a[i] に書いた直後の a[j] への書き込みは交換の後半
+            counters.swaps += 1
+            counters.writes -= 1
+            self._partner = None
+        else:
+            counters.writes += 1
+            j, i = self._reads
+            self._partner = j if i == index and j is not None and j != index else None
+        self._reads = (None, None)
+
+
+class DepthTracker:
+    """sys.setprofile で、計測対象のコードが積んだフレームの最大の深さを記録する"""
+
+    def __init__(self):
+        self.depth = 0
+        self.max_depth = 0
+
+    def __call__(self, frame, event, arg):
+        # ラッパー自身の呼び出し（__lt__ など）は深さに含めない
+        if frame.f_code.co_filename == __file__:
+            return
+        if event == "call":
+            self.depth += 1
+            if self.depth > self.max_depth:
+                self.max_depth = self.depth
+        elif event == "return":
+            self.depth -= 1
+
+
+def instrument(sort_fn, data, kind="inplace", wrap_elements=True, track_depth=True):
+    """
+    ソートを1回実行して操作回数を数える
+
+    Args:
+        sort_fn: ソート関数
+        data (list): 並べ替える要素（変更しない）
+        kind (str): "inplace" は引数を並べ替える関数、"steps" はステップ生成器関数、
+                    "returns" は新しいリストを返す関数（sortBenchmark の SORTS と同じ）
+        wrap_elements (bool): 要素をラッパーで包んで比較回数を数える。
+                              数値演算をするソート（基数・計数・バケット）では False にする
+        track_depth (bool): 最大呼び出し深さを記録する（sys.setprofile を使うので遅くなる）
+
+    Returns:
+        dict: comparisons, swaps, writes, aux_bytes, max_depth, seconds と並べ替えた結果 result。
+              数えなかった項目は None
+
+    比較は要素のラッパー、書き込みと交換は入力の配列とそのスライスに対するものを数える。
+    ソートの内部で新しく作られたリストへの書き込みは数えず、aux_bytes の方に現れる。
+    ワーカープロセスの中で行われた操作は数えられない。
+    """
+    counters = Counters()
+    items = [CountedItem(x, counters) for x in data] if wrap_elements else list(data)
+    arr = CountingList(items, counters)
+
+    tracker = DepthTracker() if track_depth else None
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        if tracker is not None:
+            sys.setprofile(tracker)
+        start = time.perf_counter()
+        try:
+            result = sort_fn(arr)
+            if kind == "steps":
+                deque(result, maxlen=0)
+            if kind != "returns":
+                result = arr
+        finally:
+            seconds = time.perf_counter() - start
+            if tracker is not None:
+                sys.setprofile(None)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    if wrap_elements:
+        result = [x.value if isinstance(x, CountedItem) else x for x in result]
+    else:
+        result = list(result)
+
+    return {
+        "comparisons": counters.comparisons if wrap_elements else None,
+        "swaps": counters.swaps,
+        "writes": counters.writes,
+        "aux_bytes": max(peak - baseline, 0),
+        "max_depth": tracker.max_depth if tracker is not None else None,
+        "seconds": seconds,
+        "result": result,
+    }
+
+
+def format_report(name, report):
+    """計測結果を1行の文字列にする"""
+    parts = [name]
+    for field in REPORT_FIELDS:
+        value = report.get(field)
+        if value is None:
+            continue
+        parts.append(f"{field}={value:.6f}" if isinstance(value, float) else f"{field}={value}")
+    return "  ".join(parts)
+
+
+if __name__ == "__main__":
+    import random
+
+    from heapSort import heap_sort
+    from introSort import intro_sort_steps, pdq_sort
+    from mergeSort import merge_sort
+    from quickSort import quick_sort_inplace
+
+    data = [random.randrange(10000) for _ in range(2000)]
+    for name, fn, kind in [
+        ("merge_sort", merge_sort, "inplace"),
+        ("quick_sort", quick_sort_inplace, "inplace"),
+        ("heap_sort", heap_sort, "inplace"),
+        ("pdq_sort", pdq_sort, "inplace"),
+        ("intro_sort", intro_sort_steps, "steps"),
+    ]:
+        report = instrument(fn, data, kind)
+        assert report["result"] == sorted(data)
+        print(format_report(name, report))
@@ -0,0 +1,107 @@
+# key= / reverse= のサポート (Decorate-Sort-Undecorate)
+# キーは要素ごとに1回だけ計算し、(キー, 元の位置) の組を並べ替えてから
+# 最後に1回だけ並び順（置換）を適用する
+
+from collections import deque
+from functools import wraps
+from types import GeneratorType
+
+import bubbleSort
+import insertionSort
+import selectionSort
+
+
+def sort_by_key(sort_fn, items, key=None, reverse=False, radix=False):
+    """
+    任意のソート関数に key / reverse を付けて実行する（安定ソート）
+
+    Args:
+        sort_fn: リストを並べ替える関数（その場で並べ替える関数、新しいリストを返す関数、
+                 ステップ生成器関数のいずれでもよい）
+        items (list): 並べ替える要素
+        key: 要素からキーを求める関数
+        reverse (bool): True なら降順（同じキーの要素は元の順序を保つ）
+        radix (bool): True なら sort_fn を使わず、整数（または整数タプル）のキーを
+                      radix_order で振り分ける
+
+    Returns:
+        list: 並べ替えた要素の新しいリスト
+    """
+    keys = [key(x) for x in items] if key is not None else list(items)
+
+    if radix:
+        if keys and not isinstance(keys[0], tuple):
+            keys = [(k,) for k in keys]
+        if keys and not is_int_tuple_keys(keys):
+            raise TypeError("radix=True needs integer keys or tuples of integers")
+        order = radix_order(keys, reverse)
+    else:
+        # 元の位置を第2キーにすると、要素そのものは一度も比較されず安定にもなる
+        sign = -1 if reverse else 1
+        decorated = [(k, sign * i) for i, k in enumerate(keys)]
+        result = sort_fn(decorated)
+        if isinstance(result, GeneratorType):
+            deque(result, maxlen=0)
+            result = decorated
+        elif result is None:
+            result = decorated
+        order = [abs(i) for _, i in result]
+        if reverse:
+            order.reverse()
+
+    return [items[i] for i in order]
+
+
+def with_key(sort_fn):
+    """
+    引数のリストを並べ替えるソート関数に key= / reverse= を付けた関数を返す
+
+    表示用の短いソート関数（bubble_sort など）はそのままにして、キー付きの版はここで作る
+    """
+    @wraps(sort_fn)
+    def keyed_sort(arr, key=None, reverse=False):
+        if key is None and not reverse:
+            return sort_fn(arr)
+        arr[:] = sort_by_key(sort_fn, arr, key, reverse)
+        return arr
+    return keyed_sort
+
+
+def is_int_tuple_keys(keys):
+    """すべてのキーが同じ長さの整数タプルかどうか"""
+    if not keys or not isinstance(keys[0], tuple):
+        return False
+    width = len(keys[0])
+    for k in keys:
+        if not isinstance(k, tuple) or len(k) != width:
+            return False
+        for part in k:
+            if not isinstance(part, int):
+                return False
+    return True
+
+
+def radix_order(keys, reverse=False):
+    """
+    複合キーの最後の成分から順に安定な振り分けを行い、並び順（インデックス）を返す
+
+    各パスは異なる値ごとのバケットに振り分けるだけなので、
+    O(n + 異なる値の数 × log(異なる値の数)) で済む
+    """
+    order = list(range(len(keys)))
+    if not keys:
+        return order
+    for position in range(len(keys[0]) - 1, -1, -1):
+        buckets = {}
+        for i in order:
+            buckets.setdefault(keys[i][position], []).append(i)
+        if len(buckets) == 1:
+            continue
+        order = [i for value in sorted(buckets, reverse=reverse) for i in buckets[value]]
+    return order
+
+
+# 表示用のソート関数のキー付きの版
+bubble_sort = with_key(bubbleSort.bubble_sort)
+selection_sort = with_key(selectionSort.selection_sort)
+insertion_sort = with_key(insertionSort.insertion_sort)
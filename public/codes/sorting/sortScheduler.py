@@ -0,0 +1,195 @@
+# フレーム単位のステップ再生 (Frame Scheduler)
+# ステップ生成器からイベントを引き出す側（消費者）がフレームレートを決める。
+# 1フレームの間に進めるステップはまとめて適用し、画面には1回だけ送る
+#
+#   scheduler = FrameScheduler(sort_steps("tim_sort", array), array, fps=60, steps_per_second=2000)
+#   for frame in scheduler.frames():
+#       draw(frame)          # 描画をやめたければ、ループを抜けるだけでよい
+#
+# 中断は生成器を捨てるだけで済み、is_sorting.current を確認する必要はない
+
+import sys
+import time
+from collections import namedtuple
+
+from sortEvents import COMPARE, SWAP, WRITE, MARK_SORTED, READ
+from bogoSort import bogo_sort_steps
+from bucketSort import bucket_sort_steps
+from countingSort import counting_sort_steps
+from introSort import intro_sort_steps
+from radixSort import radix_sort_steps
+from shellSort import shell_sort_steps
+from timSort import tim_sort_steps
+
+DEFAULT_FPS = 60
+
+# 名前からステップ生成器関数を引く（可視化ソートの公開 API）
+STEP_SORTS = {
+    "bogo_sort": bogo_sort_steps,
+    "bucket_sort": bucket_sort_steps,
+    "counting_sort": counting_sort_steps,
+    "intro_sort": intro_sort_steps,
+    "radix_sort": radix_sort_steps,
+    "shell_sort": shell_sort_steps,
+    "tim_sort": tim_sort_steps,
+}
+
+Frame = namedtuple("Frame", ["array", "comparing", "swapping", "sorted_indices", "steps", "done"])
+
+
+def sort_steps(name, array):
+    """
+    名前で指定したソートのステップ生成器を返す（配列はその場で並べ替えられる）
+
+    Args:
+        name (str): STEP_SORTS のキー
+        array (list): 並べ替える配列
+
+    Returns:
+        generator: (op, a, b) を1つずつ生成する生成器
+    """
+    if name not in STEP_SORTS:
+        raise ValueError(f"unknown sort: {name}")
+    return STEP_SORTS[name](array)
+
+
+def speed_to_rate(speed):
+    """従来の speed（1ステップあたりのミリ秒）を1秒あたりのステップ数に変換する（0 以下は無制限で None）"""
+    return 1000.0 / speed if speed > 0 else None
+
+
+class FrameScheduler:
+    """
+    ステップ生成器を一定のフレームレートで再生する
+
+    steps_per_second が None なら待機せず、1フレームに steps_per_frame 個ずつ進める。
+    指定した場合は経過時間から進めるべきステップ数を求めるので、描画が遅れても
+    アニメーション全体の速さは変わらない（遅れた分は次のフレームにまとめる）
+    """
+
+    def __init__(self, steps, array, fps=DEFAULT_FPS, steps_per_second=None, steps_per_frame=1):
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        self.steps = steps
+        self.array = array
+        self.fps = fps
+        self.steps_per_second = steps_per_second
+        self.steps_per_frame = steps_per_frame
+        self.step_count = 0
+        self.done = False
+        self._sorted = set()
+        self._sorted_list = []
+        self._budget = 0.0
+
+    def advance(self, count):
+        """
+        最大 count ステップ進めて、その結果を1つのフレームにまとめて返す
+
+        強調表示はフレーム内で最後に起きた比較・交換だけを残す
+        """
+        comparing = []
+        swapping = []
+        marked = False
+        for _ in range(count):
+            event = next(self.steps, None)
+            if event is None:
+                self.done = True
+                break
+            op, a, b = event
+            self.step_count += 1
+            if op == COMPARE:
+                comparing = [a, b]
+                swapping = []
+            elif op == READ:
+                comparing = [a]
+                swapping = []
+            elif op == SWAP:
+                swapping = [a, b]
+            elif op == WRITE:
+                swapping = []
+            elif op == MARK_SORTED:
+                self._sorted.update(range(a, b))
+                marked = True
+
+        if marked:
+            self._sorted_list = sorted(self._sorted)
+        if self.done:
+            comparing = []
+            swapping = []
+        return Frame(list(self.array), comparing, swapping, self._sorted_list, self.step_count, self.done)
+
+    def frames(self, clock=time.monotonic, sleep=time.sleep):
+        """
+        完了するまでフレームを生成する
+
+        生成器を途中で捨てる（close する）と、ソートのステップ生成器も閉じられる
+        """
+        interval = 1.0 / self.fps
+        last = clock()
+        deadline = last + interval
+        try:
+            while not self.done:
+                now = clock()
+                if self.steps_per_second is None:
+                    count = self.steps_per_frame
+                else:
+                    self._budget += (now - last) * self.steps_per_second
+                    count = int(self._budget)
+                    self._budget -= count
+                last = now
+                if count or self.steps_per_second is None:
+                    yield self.advance(count)
+
+                # 次のフレームの時刻まで待つ。遅れていれば待たずに進める
+                remaining = deadline - clock()
+                if remaining > 0:
+                    sleep(remaining)
+                    deadline += interval
+                else:
+                    deadline = clock() + interval
+        finally:
+            self.close()
+
+    def close(self):
+        """ステップ生成器を閉じる"""
+        self.steps.close()
+        self.done = True
+
+
+def animate(steps, array, render, fps=DEFAULT_FPS, speed=None):
+    """
+    フレームごとに render(frame) を呼び出してソートを再生する
+
+    Args:
+        steps: ステップ生成器
+        array (list): steps が並べ替えている配列
+        render: Frame を受け取る関数。False を返すと再生を中断する
+        fps (int): 目標フレームレート
+        speed (float): 1ステップあたりのミリ秒（従来の speed と同じ意味）。
+                       None なら1フレーム1ステップ、0 以下なら待たずに最後まで進める
+
+    Returns:
+        bool: 最後まで再生したら True
+    """
+    if speed is None:
+        scheduler = FrameScheduler(steps, array, fps)
+    elif speed <= 0:
+        scheduler = FrameScheduler(steps, array, fps, steps_per_frame=sys.maxsize)
+    else:
+        scheduler = FrameScheduler(steps, array, fps, speed_to_rate(speed))
+    frames = scheduler.frames()
+    for frame in frames:
+        if render(frame) is False:
+            frames.close()
+            return False
+    return True
+
+
+def legacy_render(set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices):
+    """従来の4つのコールバックに Frame を送る render 関数を作る"""
+    def render(frame):
+        set_array(frame.array)
+        set_comparing_indices(frame.comparing)
+        set_swapping_indices(frame.swapping)
+        set_sorted_indices(frame.sorted_indices)
+    return render
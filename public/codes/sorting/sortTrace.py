@@ -0,0 +1,174 @@
+# ソートのステップ記録と再生 (Sort Trace Recorder / Player)
+# ステップイベントを固定長のバイナリとして保存し、mmap で任意のステップへ移動する
+#
+# ファイル構成（どの値も 8 バイト。ヘッダー以外は array のネイティブバイト順）
+#   ヘッダー     magic, 値の型コード ("q" = int64 / "d" = float64), n, steps,
+#                keyframe_interval, keyframe_count, value_count
+#   キーフレーム keyframe_count 個の配列スナップショット（各 n 要素、値の型）
+#   値の列       WRITE で書き込まれた値（値の型）
+#   レコード     steps 個の (op, a, b)（int64）。WRITE の b は値の列での位置
+#
+# キーフレーム k は k * keyframe_interval ステップ適用後の配列。
+# 任意のステップへは直前のキーフレームから最大 keyframe_interval 個を再生するだけでよい
+
+import mmap
+import struct
+from array import array as typed_array
+
+from sortEvents import SWAP, WRITE
+
+MAGIC = b"SORTTRC2"
+HEADER = struct.Struct("<8s1s7xqqqqq")
+VALUE_TYPECODES = ("q", "d")
+
+
+def value_typecode(array):
+    """配列の値を保存する型コード（すべて整数なら "q"、それ以外は "d"）"""
+    return "q" if all(isinstance(v, int) for v in array) else "d"
+
+
+class TraceRecorder:
+    """ステップイベントを int64 の配列に、書き込まれた値を値の型の配列に詰めて記録する"""
+
+    def __init__(self, array, keyframe_interval=4096, typecode=None):
+        """
+        Args:
+            array (list): ソートする配列（記録開始時の状態）
+            keyframe_interval (int): キーフレームを作るステップ間隔
+            typecode (str): 値の型コード "q" または "d"（省略時は array の値から選ぶ）
+        """
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be positive")
+        typecode = typecode or value_typecode(array)
+        if typecode not in VALUE_TYPECODES:
+            raise ValueError(f"typecode must be 'q' or 'd': {typecode}")
+        self.typecode = typecode
+        self.n = len(array)
+        self.keyframe_interval = keyframe_interval
+        self.mirror = typed_array(typecode, array)  # 記録用に差分だけで更新する複製
+        self.keyframes = typed_array(typecode, self.mirror)
+        self.values = typed_array(typecode)
+        self.records = typed_array("q")
+        self.steps = 0
+
+    def __call__(self, op, a, b):
+        self.record(op, a, b)
+
+    def record(self, op, a, b):
+        """イベントを1つ記録する - O(1)（キーフレーム作成時のみ O(n)）"""
+        if op == WRITE:
+            self.mirror[a] = b
+            self.values.append(b)
+            self.records.extend((op, a, len(self.values) - 1))
+        else:
+            self.records.extend((op, a, b))
+            if op == SWAP:
+                self.mirror[a], self.mirror[b] = self.mirror[b], self.mirror[a]
+        self.steps += 1
+        if self.steps % self.keyframe_interval == 0:
+            self.keyframes.extend(self.mirror)
+
+    def save(self, path):
+        """記録内容をファイルに書き出す"""
+        keyframe_count = self.steps // self.keyframe_interval + 1
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.typecode.encode(), self.n, self.steps,
+                                self.keyframe_interval, keyframe_count, len(self.values)))
+            self.keyframes.tofile(f)
+            self.values.tofile(f)
+            self.records.tofile(f)
+
+
+def record_trace(steps, array, path, keyframe_interval=4096):
+    """
+    ステップ生成器を最後まで実行し、その過程をファイルに記録する
+
+    Args:
+        steps: tim_sort_steps(array) などのステップ生成器
+        array (list): steps がソートする配列（整数または浮動小数点数）
+        path (str): 出力先のファイルパス
+        keyframe_interval (int): キーフレームを作るステップ間隔
+
+    Returns:
+        int: 記録したステップ数
+    """
+    recorder = TraceRecorder(array, keyframe_interval)
+    record = recorder.record
+    for op, a, b in steps:
+        record(op, a, b)
+    recorder.save(path)
+    return recorder.steps
+
+
+class TracePlayer:
+    """記録ファイルを mmap し、任意のステップのイベントやフレームを取り出す"""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._records = None
+        (magic, typecode, self.n, self.steps, self.keyframe_interval,
+         keyframe_count, value_count) = HEADER.unpack_from(self._mmap)
+        self.typecode = typecode.decode()
+        if magic != MAGIC or self.typecode not in VALUE_TYPECODES:
+            self.close()
+            raise ValueError(f"{path} is not a sort trace file")
+
+        data = memoryview(self._mmap)
+        values_start = HEADER.size + keyframe_count * self.n * 8
+        records_start = values_start + value_count * 8
+        self._keyframes = data[HEADER.size:values_start].cast(self.typecode)
+        self._values = data[values_start:records_start].cast(self.typecode)
+        self._records = data[records_start:].cast("q")
+        data.release()
+
+    def __len__(self):
+        return self.steps
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """mmap とファイルを閉じる"""
+        if self._records is not None:
+            self._records.release()
+            self._values.release()
+            self._keyframes.release()
+            self._records = self._values = self._keyframes = None
+        self._mmap.close()
+        self._file.close()
+
+    def event(self, step):
+        """step 番目のイベント (op, a, b) を返す - O(1)"""
+        if not 0 <= step < self.steps:
+            raise IndexError("step out of range")
+        base = step * 3
+        op, a, b = self._records[base], self._records[base + 1], self._records[base + 2]
+        if op == WRITE:
+            b = self._values[b]
+        return op, a, b
+
+    def frame(self, step):
+        """
+        step 個のイベントを適用した後の配列を返す
+
+        直前のキーフレームから再生するので、記録全体の長さに依存しない
+        """
+        if not 0 <= step <= self.steps:
+            raise IndexError("step out of range")
+        k = step // self.keyframe_interval
+        arr = self._keyframes[k * self.n:(k + 1) * self.n].tolist()
+        records = self._records
+        values = self._values
+        for base in range(k * self.keyframe_interval * 3, step * 3, 3):
+            op = records[base]
+            a = records[base + 1]
+            b = records[base + 2]
+            if op == SWAP:
+                arr[a], arr[b] = arr[b], arr[a]
+            elif op == WRITE:
+                arr[a] = values[b]
+        return arr
@@ -1,81 +1,473 @@
-def tim_sort(array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting):
+from sortEvents import COMPARE, SWAP, WRITE, MARK_SORTED, run_visual
+
+MIN_MERGE = 32
+MIN_GALLOP = 7
+
+
+def tim_sort(array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting, on_step=None):
+    run_visual(tim_sort_steps(array), array, set_array, set_comparing_indices, set_swapping_indices, set_sorted_indices, speed, is_sorting, on_step)
+
+
+def compute_min_run(n):
+    # n の上位 5-6 ビットを取り、残りのビットが1つでも立っていれば 1 を足す
+    r = 0
+    while n >= MIN_MERGE:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+
+def tim_sort_steps(array):
     n = len(array)
-    MIN_MERGE = 32
-
-    def insertion_sort_tim(arr, left, right):
-        for i in range(left + 1, right + 1):
-            temp = arr[i]
-            j = i - 1
-            while j >= left and arr[j] > temp:
-                if not is_sorting.current: return
-                set_comparing_indices([j, j + 1])
-                set_array(list(arr))
-                time.sleep(speed / 1000.0)
-                arr[j + 1] = arr[j]
-                j -= 1
-            arr[j + 1] = temp
-            set_array(list(arr))
-            time.sleep(speed / 1000.0)
-
-    def merge_tim(arr, l, m, r):
-        len1 = m - l + 1
-        len2 = r - m
-        left_arr = [0] * len1
-        right_arr = [0] * len2
-
-        for i in range(len1): left_arr[i] = arr[l + i]
-        for i in range(len2): right_arr[i] = arr[m + 1 + i]
-
-        i = 0
-        j = 0
-        k = l
-
-        while i < len1 and j < len2:
-            if not is_sorting.current: return
-            set_comparing_indices([l + i, m + 1 + j])
-            set_array(list(arr))
-            time.sleep(speed / 1000.0)
-            if left_arr[i] <= right_arr[j]:
-                arr[k] = left_arr[i]
-                i += 1
+    arr = array
+    tmp = []  # 必要に応じて伸ばし、すべてのマージで使い回す1つのバッファー
+    run_base = []
+    run_len = []
+    min_gallop = MIN_GALLOP
+
+    def copy_into(dest, src, start, count):
+        arr[dest:dest + count] = src[start:start + count]
+        for k in range(dest, dest + count):
+            yield WRITE, k, arr[k]
+
+    def reverse_range(lo, hi):
+        hi -= 1
+        while lo < hi:
+            arr[lo], arr[hi] = arr[hi], arr[lo]
+            yield SWAP, lo, hi
+            lo += 1
+            hi -= 1
+
+    def count_run_and_make_ascending(lo, hi):
+        run_hi = lo + 1
+        if run_hi == hi:
+            return 1
+
+        yield COMPARE, run_hi, lo
+        if arr[run_hi] < arr[lo]:
+            # 狭義の降順のランはその場で反転する（これで安定性が保たれる）
+            run_hi += 1
+            while run_hi < hi:
+                yield COMPARE, run_hi, run_hi - 1
+                if not arr[run_hi] < arr[run_hi - 1]:
+                    break
+                run_hi += 1
+            yield from reverse_range(lo, run_hi)
+        else:
+            run_hi += 1
+            while run_hi < hi:
+                yield COMPARE, run_hi, run_hi - 1
+                if arr[run_hi] < arr[run_hi - 1]:
+                    break
+                run_hi += 1
+        return run_hi - lo
+
+    def binary_insertion_sort(lo, hi, start):
+        # arr[lo:start] は整列済み
+        for i in range(start, hi):
+            pivot = arr[i]
+            left = lo
+            right = i
+            while left < right:
+                mid = (left + right) // 2
+                yield COMPARE, i, mid
+                if pivot < arr[mid]:
+                    right = mid
+                else:
+                    left = mid + 1
+            if left == i:
+                continue
+            for j in range(i, left, -1):
+                arr[j] = arr[j - 1]
+                yield WRITE, j, arr[j]
+            arr[left] = pivot
+            yield WRITE, left, pivot
+
+    def gallop_left(key, key_index, a, base, length, hint, shown):
+        # a[base + k - 1] < key <= a[base + k] となる最も左の k
+        last_ofs = 0
+        ofs = 1
+        yield COMPARE, key_index, shown + hint
+        if a[base + hint] < key:
+            max_ofs = length - hint
+            while ofs < max_ofs:
+                yield COMPARE, key_index, shown + hint + ofs
+                if not a[base + hint + ofs] < key:
+                    break
+                last_ofs = ofs
+                ofs = (ofs << 1) + 1
+            if ofs > max_ofs:
+                ofs = max_ofs
+            last_ofs += hint
+            ofs += hint
+        else:
+            max_ofs = hint + 1
+            while ofs < max_ofs:
+                yield COMPARE, key_index, shown + hint - ofs
+                if a[base + hint - ofs] < key:
+                    break
+                last_ofs = ofs
+                ofs = (ofs << 1) + 1
+            if ofs > max_ofs:
+                ofs = max_ofs
+            last_ofs, ofs = hint - ofs, hint - last_ofs
+
+        last_ofs += 1
+        while last_ofs < ofs:
+            m = last_ofs + ((ofs - last_ofs) >> 1)
+            yield COMPARE, key_index, shown + m
+            if a[base + m] < key:
+                last_ofs = m + 1
+            else:
+                ofs = m
+        return ofs
+
+    def gallop_right(key, key_index, a, base, length, hint, shown):
+        # a[base + k - 1] <= key < a[base + k] となる最も右の k
+        last_ofs = 0
+        ofs = 1
+        yield COMPARE, key_index, shown + hint
+        if key < a[base + hint]:
+            max_ofs = hint + 1
+            while ofs < max_ofs:
+                yield COMPARE, key_index, shown + hint - ofs
+                if not key < a[base + hint - ofs]:
+                    break
+                last_ofs = ofs
+                ofs = (ofs << 1) + 1
+            if ofs > max_ofs:
+                ofs = max_ofs
+            last_ofs, ofs = hint - ofs, hint - last_ofs
+        else:
+            max_ofs = length - hint
+            while ofs < max_ofs:
+                yield COMPARE, key_index, shown + hint + ofs
+                if key < a[base + hint + ofs]:
+                    break
+                last_ofs = ofs
+                ofs = (ofs << 1) + 1
+            if ofs > max_ofs:
+                ofs = max_ofs
+            last_ofs += hint
+            ofs += hint
+
+        last_ofs += 1
+        while last_ofs < ofs:
+            m = last_ofs + ((ofs - last_ofs) >> 1)
+            yield COMPARE, key_index, shown + m
+            if key < a[base + m]:
+                ofs = m
             else:
-                arr[k] = right_arr[j]
-                j += 1
-            set_array(list(arr))
-            time.sleep(speed / 1000.0)
-            k += 1
-
-        while i < len1:
-            if not is_sorting.current: return
-            arr[k] = left_arr[i]
-            set_array(list(arr))
-            time.sleep(speed / 1000.0)
-            k += 1
-            i += 1
-
-        while j < len2:
-            if not is_sorting.current: return
-            arr[k] = right_arr[j]
-            set_array(list(arr))
-            time.sleep(speed / 1000.0)
-            k += 1
-            j += 1
-
-    for i in range(0, n, MIN_MERGE):
-        insertion_sort_tim(array, i, min((i + MIN_MERGE - 1), (n - 1)))
-
-    size = MIN_MERGE
-    while size < n:
-        left = 0
-        while left < n:
-            mid = left + size - 1
-            right = min((left + 2 * size - 1), (n - 1))
-            if mid < right:
-                merge_tim(array, left, mid, right)
-            left += 2 * size
-        size *= 2
-
-    set_sorted_indices(list(range(n)))
-    set_comparing_indices([])
-
-import time
\ No newline at end of file
+                last_ofs = m + 1
+        return ofs
+
+    def ensure_capacity(size):
+        if len(tmp) < size:
+            tmp.extend([None] * (size - len(tmp)))
+
+    def merge_lo(base1, len1, base2, len2):
+        nonlocal min_gallop
+        ensure_capacity(len1)
+        tmp[0:len1] = arr[base1:base1 + len1]
+        cursor1 = 0
+        cursor2 = base2
+        dest = base1
+
+        arr[dest] = arr[cursor2]
+        yield WRITE, dest, arr[dest]
+        dest += 1
+        cursor2 += 1
+        len2 -= 1
+        if len2 == 0:
+            yield from copy_into(dest, tmp, cursor1, len1)
+            return
+        if len1 == 1:
+            yield from copy_into(dest, arr, cursor2, len2)
+            arr[dest + len2] = tmp[cursor1]
+            yield WRITE, dest + len2, tmp[cursor1]
+            return
+
+        gallop = min_gallop
+        done = False
+        while not done:
+            count1 = 0
+            count2 = 0
+
+            # 一方のランが勝ち続けるようになるまで1組ずつ比べる
+            while (count1 | count2) < gallop:
+                yield COMPARE, cursor2, base1 + cursor1
+                if arr[cursor2] < tmp[cursor1]:
+                    arr[dest] = arr[cursor2]
+                    yield WRITE, dest, arr[dest]
+                    dest += 1
+                    cursor2 += 1
+                    count2 += 1
+                    count1 = 0
+                    len2 -= 1
+                    if len2 == 0:
+                        done = True
+                        break
+                else:
+                    arr[dest] = tmp[cursor1]
+                    yield WRITE, dest, arr[dest]
+                    dest += 1
+                    cursor1 += 1
+                    count1 += 1
+                    count2 = 0
+                    len1 -= 1
+                    if len1 == 1:
+                        done = True
+                        break
+            if done:
+                break
+
+            # ギャロップモード: 指数探索で見つけたブロックをまとめて写す
+            while True:
+                count1 = yield from gallop_right(arr[cursor2], cursor2, tmp, cursor1, len1, 0, base1 + cursor1)
+                if count1 != 0:
+                    yield from copy_into(dest, tmp, cursor1, count1)
+                    dest += count1
+                    cursor1 += count1
+                    len1 -= count1
+                    if len1 <= 1:
+                        done = True
+                        break
+                arr[dest] = arr[cursor2]
+                yield WRITE, dest, arr[dest]
+                dest += 1
+                cursor2 += 1
+                len2 -= 1
+                if len2 == 0:
+                    done = True
+                    break
+
+                count2 = yield from gallop_left(tmp[cursor1], base1 + cursor1, arr, cursor2, len2, 0, cursor2)
+                if count2 != 0:
+                    yield from copy_into(dest, arr, cursor2, count2)
+                    dest += count2
+                    cursor2 += count2
+                    len2 -= count2
+                    if len2 == 0:
+                        done = True
+                        break
+                arr[dest] = tmp[cursor1]
+                yield WRITE, dest, arr[dest]
+                dest += 1
+                cursor1 += 1
+                len1 -= 1
+                if len1 == 1:
+                    done = True
+                    break
+                gallop -= 1
+                if count1 < MIN_GALLOP and count2 < MIN_GALLOP:
+                    break
+            if done:
+                break
+            if gallop < 0:
+                gallop = 0
+            gallop += 2  # ギャロップモードを抜けたら入りにくくする
+
+        min_gallop = max(1, gallop)
+        if len1 == 1:
+            yield from copy_into(dest, arr, cursor2, len2)
+            arr[dest + len2] = tmp[cursor1]
+            yield WRITE, dest + len2, tmp[cursor1]
+        elif len1 == 0:
+            raise ValueError("Comparison method violates its general contract")
+        else:
+            yield from copy_into(dest, tmp, cursor1, len1)
+
+    def merge_hi(base1, len1, base2, len2):
+        nonlocal min_gallop
+        ensure_capacity(len2)
+        tmp[0:len2] = arr[base2:base2 + len2]
+        cursor1 = base1 + len1 - 1
+        cursor2 = len2 - 1
+        dest = base2 + len2 - 1
+
+        arr[dest] = arr[cursor1]
+        yield WRITE, dest, arr[dest]
+        dest -= 1
+        cursor1 -= 1
+        len1 -= 1
+        if len1 == 0:
+            yield from copy_into(dest - (len2 - 1), tmp, 0, len2)
+            return
+        if len2 == 1:
+            dest -= len1
+            cursor1 -= len1
+            yield from copy_into(dest + 1, arr, cursor1 + 1, len1)
+            arr[dest] = tmp[cursor2]
+            yield WRITE, dest, tmp[cursor2]
+            return
+
+        gallop = min_gallop
+        done = False
+        while not done:
+            count1 = 0
+            count2 = 0
+
+            while (count1 | count2) < gallop:
+                yield COMPARE, base2 + cursor2, cursor1
+                if tmp[cursor2] < arr[cursor1]:
+                    arr[dest] = arr[cursor1]
+                    yield WRITE, dest, arr[dest]
+                    dest -= 1
+                    cursor1 -= 1
+                    count1 += 1
+                    count2 = 0
+                    len1 -= 1
+                    if len1 == 0:
+                        done = True
+                        break
+                else:
+                    arr[dest] = tmp[cursor2]
+                    yield WRITE, dest, arr[dest]
+                    dest -= 1
+                    cursor2 -= 1
+                    count2 += 1
+                    count1 = 0
+                    len2 -= 1
+                    if len2 == 1:
+                        done = True
+                        break
+            if done:
+                break
+
+            while True:
+                k = yield from gallop_right(tmp[cursor2], base2 + cursor2, arr, base1, len1, len1 - 1, base1)
+                count1 = len1 - k
+                if count1 != 0:
+                    dest -= count1
+                    cursor1 -= count1
+                    len1 -= count1
+                    yield from copy_into(dest + 1, arr, cursor1 + 1, count1)
+                    if len1 == 0:
+                        done = True
+                        break
+                arr[dest] = tmp[cursor2]
+                yield WRITE, dest, arr[dest]
+                dest -= 1
+                cursor2 -= 1
+                len2 -= 1
+                if len2 == 1:
+                    done = True
+                    break
+
+                k = yield from gallop_left(arr[cursor1], cursor1, tmp, 0, len2, len2 - 1, base2)
+                count2 = len2 - k
+                if count2 != 0:
+                    dest -= count2
+                    cursor2 -= count2
+                    len2 -= count2
+                    yield from copy_into(dest + 1, tmp, cursor2 + 1, count2)
+                    if len2 <= 1:
+                        done = True
+                        break
+                arr[dest] = arr[cursor1]
+                yield WRITE, dest, arr[dest]
+                dest -= 1
+                cursor1 -= 1
+                len1 -= 1
+                if len1 == 0:
+                    done = True
+                    break
+                gallop -= 1
+                if count1 < MIN_GALLOP and count2 < MIN_GALLOP:
+                    break
+            if done:
+                break
+            if gallop < 0:
+                gallop = 0
+            gallop += 2
+
+        min_gallop = max(1, gallop)
+        if len2 == 1:
+            dest -= len1
+            cursor1 -= len1
+            yield from copy_into(dest + 1, arr, cursor1 + 1, len1)
+            arr[dest] = tmp[cursor2]
+            yield WRITE, dest, tmp[cursor2]
+        elif len2 == 0:
+            raise ValueError("Comparison method violates its general contract")
+        else:
+            yield from copy_into(dest - (len2 - 1), tmp, 0, len2)
+
+    def merge_at(i):
+        base1 = run_base[i]
+        len1 = run_len[i]
+        base2 = run_base[i + 1]
+        len2 = run_len[i + 1]
+
+        run_len[i] = len1 + len2
+        del run_base[i + 1]
+        del run_len[i + 1]
+
+        # ラン1のうち、すでに run2[0] 以下の要素はそのままでよい
+        k = yield from gallop_right(arr[base2], base2, arr, base1, len1, 0, base1)
+        base1 += k
+        len1 -= k
+        if len1 == 0:
+            return
+
+        # ラン2のうち、すでに run1[-1] 以上の要素はそのままでよい
+        len2 = yield from gallop_left(arr[base1 + len1 - 1], base1 + len1 - 1, arr, base2, len2, len2 - 1, base2)
+        if len2 == 0:
+            return
+
+        if len1 <= len2:
+            yield from merge_lo(base1, len1, base2, len2)
+        else:
+            yield from merge_hi(base1, len1, base2, len2)
+
+    def merge_collapse():
+        # run_len[i - 2] > run_len[i - 1] + run_len[i] と run_len[i - 1] > run_len[i] を保つ
+        while len(run_len) > 1:
+            i = len(run_len) - 2
+            if (i > 0 and run_len[i - 1] <= run_len[i] + run_len[i + 1]) or \
+                    (i > 1 and run_len[i - 2] <= run_len[i - 1] + run_len[i]):
+                if run_len[i - 1] < run_len[i + 1]:
+                    i -= 1
+            elif run_len[i] > run_len[i + 1]:
+                break
+            yield from merge_at(i)
+
+    def merge_force_collapse():
+        while len(run_len) > 1:
+            i = len(run_len) - 2
+            if i > 0 and run_len[i - 1] < run_len[i + 1]:
+                i -= 1
+            yield from merge_at(i)
+
+    if n < 2:
+        yield MARK_SORTED, 0, n
+        return
+
+    if n < MIN_MERGE:
+        initial_run = yield from count_run_and_make_ascending(0, n)
+        yield from binary_insertion_sort(0, n, initial_run)
+        yield MARK_SORTED, 0, n
+        return
+
+    min_run = compute_min_run(n)
+    lo = 0
+    remaining = n
+    while remaining > 0:
+        length = yield from count_run_and_make_ascending(lo, n)
+
+        # 短い自然なランは二分挿入ソートで min_run まで伸ばす
+        if length < min_run:
+            force = min(remaining, min_run)
+            yield from binary_insertion_sort(lo, lo + force, lo + length)
+            length = force
+
+        run_base.append(lo)
+        run_len.append(length)
+        yield from merge_collapse()
+
+        lo += length
+        remaining -= length
+
+    yield from merge_force_collapse()
+
+    yield MARK_SORTED, 0, n
@@ -0,0 +1,29 @@
+# public/codes のスクリプトをテストから読み込むための設定
+# ソートのモジュールはお互いを名前で import するので、sorting をパスに加える。
+# 探索のスクリプトはファイル名にハイフンを含むので、ファイルから直接読み込む
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+CODES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "public", "codes")
+sys.path.insert(0, os.path.join(CODES, "sorting"))
+
+
+def load_search_module(name):
+    """public/codes/search/<name>.py をモジュールとして読み込む"""
+    module_name = name.replace("-", "_")
+    if module_name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(CODES, "search", f"{name}.py"))
+        module = importlib.util.module_from_spec(spec)
+        # ワーカープロセスに関数を送れるよう、pickle が探す名前で登録する
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[module_name]
+
+
+@pytest.fixture
+def load_search():
+    return load_search_module
@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+
+@pytest.fixture
+def adaptive(load_search):
+    return load_search("adaptive-search")
+
+
+@pytest.mark.parametrize("sample_size", [0, -3])
+def test_no_samples_means_binary_search(adaptive, sample_size):
+    array = list(range(0, 1000, 2))
+    searcher = adaptive.AdaptiveSearcher(array, sample_size=sample_size)
+    assert searcher.method == "binary"
+    assert searcher.search(500)[0] == 250
+
+
+def test_small_arrays_use_binary_search(adaptive):
+    assert adaptive.AdaptiveSearcher([1, 2, 3]).method == "binary"
+    assert adaptive.AdaptiveSearcher([]).search(1) == (-1, 0)
+
+
+def test_methods_agree(adaptive):
+    rng = random.Random(0)
+    array = sorted(rng.randrange(10000) for _ in range(2000))
+    uniform = adaptive.AdaptiveSearcher(array)
+    assert uniform.method == "interpolation"
+    hint = 0
+    for target in range(-5, 10005, 7):
+        expected = array.index(target) if target in array else -1
+        assert adaptive.binary_search_probes(array, target)[0] == expected
+        assert adaptive.interpolation_search(array, target)[0] == expected
+        assert adaptive.exponential_search(array, target)[0] == expected
+        index, _ = adaptive.galloping_search(array, target, hint)
+        assert index == expected
+        hint = index if index >= 0 else hint
+        assert uniform.search(target, sequential=True)[0] == expected
@@ -0,0 +1,19 @@
+import pytest
+
+
+@pytest.fixture
+def search(load_search):
+    return load_search("binary-search")
+
+
+def test_batch_binary_search_accepts_a_generator(search):
+    array = [10, 20, 30, 40]
+    targets = [5, 20, 40, 41]
+    assert search.batch_binary_search(array, (t for t in targets)) == [-1, 1, 3, -1]
+
+
+def test_batch_search_matches_bisect(search):
+    array = [1, 3, 3, 3, 7, 9, 11]
+    targets = [3, 4, 11, 0, 12]
+    assert search.batch_search(array, targets, "left") == [1, 4, 6, 0, 7]
+    assert search.batch_search(array, iter(targets), "right") == [4, 4, 7, 0, 7]
@@ -0,0 +1,29 @@
+import random
+
+import bucketSort
+from bucketSort import INSERTION_CUTOFF, PARALLEL_THRESHOLD, sample_bucket_sort, sort_bucket
+
+
+def test_sample_bucket_sort_skewed_and_duplicates():
+    rng = random.Random(2)
+    skewed = [rng.expovariate(1.0) ** 4 for _ in range(20000)]
+    assert sample_bucket_sort(skewed) == sorted(skewed)
+    dups = [rng.randrange(3) for _ in range(5000)]
+    assert sample_bucket_sort(dups) == sorted(dups)
+
+
+def test_buckets_use_the_module_sorts(monkeypatch):
+    used = []
+    monkeypatch.setattr(bucketSort, "insertion_sort_bucket", lambda b: used.append("insertion") or sorted(b))
+    monkeypatch.setattr(bucketSort, "merge_sort_buffered", lambda b: used.append("merge") or sorted(b))
+    sort_bucket(list(range(INSERTION_CUTOFF, 0, -1)))
+    sort_bucket(list(range(INSERTION_CUTOFF + 1, 0, -1)))
+    assert used == ["insertion", "merge"]
+
+
+def test_sample_bucket_sort_key_reverse_and_parallel():
+    rng = random.Random(4)
+    items = [(rng.random(), i) for i in range(2000)]
+    assert sample_bucket_sort(items, key=lambda p: p[0], reverse=True) == sorted(items, reverse=True)
+    data = [rng.random() for _ in range(PARALLEL_THRESHOLD)]
+    assert sample_bucket_sort(data, workers=2) == sorted(data)
@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+from countingSort import PARALLEL_THRESHOLD, counting_sort_array
+
+
+def test_counting_sort_keeps_the_original_elements():
+    data = [1, 1.0, True, 0, False]
+    result = counting_sort_array(data)
+    assert result == [0, False, 1, 1.0, True]
+    assert [type(x) for x in result] == [int, bool, int, float, bool]
+
+
+@pytest.mark.parametrize("mode", ["auto", "dense", "sparse"])
+def test_counting_sort_modes(mode):
+    data = [random.randrange(-50, 50) for _ in range(1000)]
+    assert counting_sort_array(data, mode=mode) == sorted(data)
+    assert counting_sort_array(data, mode=mode, reverse=True) == sorted(data, reverse=True)
+
+
+def test_counting_sort_non_int_keys():
+    assert counting_sort_array([0.5, 1.5, 2.5, 0.5]) == [0.5, 0.5, 1.5, 2.5]
+    with pytest.raises(TypeError):
+        counting_sort_array([0.5], mode="dense")
+
+
+@pytest.mark.parametrize("mode", ["dense", "sparse"])
+def test_counting_sort_key_is_stable_and_honors_mode(mode):
+    records = [(random.randrange(10), i) for i in range(500)]
+    expected = sorted(records, key=lambda r: r[0], reverse=True)
+    assert counting_sort_array(records, mode=mode, key=lambda r: r[0], reverse=True) == expected
+    with pytest.raises(ValueError):
+        counting_sort_array(records, mode="bogus", key=lambda r: r[0])
+
+
+@pytest.mark.parametrize("mode", ["dense", "sparse"])
+def test_counting_sort_parallel_histogram(mode):
+    data = [random.randrange(1000) for _ in range(PARALLEL_THRESHOLD)]
+    assert counting_sort_array(data, mode=mode, workers=2) == sorted(data)
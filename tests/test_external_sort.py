@@ -0,0 +1,39 @@
+import random
+import tracemalloc
+
+import pytest
+
+from externalSort import external_sort, write_run
+
+
+def run_sort(tmp_path, lines, **options):
+    source = tmp_path / "input.txt"
+    target = tmp_path / "output.txt"
+    source.write_bytes(b"".join(line + b"\n" for line in lines))
+    external_sort(str(source), str(target), tmp_dir=str(tmp_path), **options)
+    return target.read_bytes().split(b"\n")[:-1]
+
+
+@pytest.mark.parametrize("budget", [10**6, 200])
+def test_external_sort_lines(tmp_path, budget):
+    rng = random.Random(budget)
+    lines = [str(rng.random()).encode() for _ in range(2000)]
+    assert run_sort(tmp_path, lines, memory_budget=budget, fan_in=2) == sorted(lines)
+
+
+@pytest.mark.parametrize("budget", [10**6, 20])
+def test_radix_runs_keep_the_original_lines(tmp_path, budget):
+    lines = [b"007", b"+5", b" 12", b"10\r", b"-3", b"5", b"7"]
+    assert run_sort(tmp_path, lines, memory_budget=budget, fan_in=2, chunk_sort="radix") == sorted(lines, key=int)
+
+
+def test_write_run_does_not_copy_the_run(tmp_path):
+    chunk = [b"%099d" % i for i in range(100000, 0, -1)]
+    data_bytes = sum(len(line) for line in chunk)
+    tracemalloc.start()
+    try:
+        write_run(chunk, str(tmp_path), 0, None, "timsort")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < data_bytes // 4
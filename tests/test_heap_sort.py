@@ -0,0 +1,25 @@
+import random
+from collections import deque
+
+import pytest
+
+import introSort
+from heapSort import heap_sort
+
+
+@pytest.mark.parametrize("arity", [2, 3, 4, 8])
+def test_heap_sort_arities(arity):
+    rng = random.Random(arity)
+    data = [rng.randrange(50) for _ in range(700)]
+    assert heap_sort(list(data), arity=arity) == sorted(data)
+
+
+def test_intro_sort_heap_fallback_keeps_every_element(monkeypatch):
+    # 値が元の位置まで戻ってくる sift でも、最後の書き戻しで要素が失われないこと
+    monkeypatch.setattr(introSort, "log2_floor", lambda n: 1)
+    rng = random.Random(0)
+    for _ in range(100):
+        data = [rng.randrange(30) for _ in range(rng.randrange(200))]
+        arr = list(data)
+        deque(introSort.intro_sort_steps(arr), maxlen=0)
+        assert arr == sorted(data)
@@ -0,0 +1,56 @@
+import random
+from collections import deque
+
+import pytest
+
+import introSort
+from introSort import intro_sort_steps, pdq_sort
+from sortInstrument import CountedItem, Counters
+
+
+def run_counted(sort_fn, data):
+    # 並べ替えた後の各要素の元の位置と、比較回数
+    counters = Counters()
+    items = [CountedItem(x, counters) for x in data]
+    position = {id(item): i for i, item in enumerate(items)}
+    sort_fn(items)
+    return [position[id(item)] for item in items], counters.comparisons
+
+
+def assert_consistent(data):
+    # pdq_sort は intro_sort_steps からステップを除いたものなので、同じ置換と同じ比較回数になる
+    steps = run_counted(lambda a: deque(intro_sort_steps(a), maxlen=0), data)
+    fast = run_counted(pdq_sort, data)
+    assert steps == fast
+    assert [data[i] for i in fast[0]] == sorted(data)
+
+
+def patterns(n=3000, seed=0):
+    rng = random.Random(seed)
+    return {
+        "random": [rng.randrange(n) for _ in range(n)],
+        "few distinct": [rng.randrange(4) for _ in range(n)],
+        "sorted": list(range(n)),
+        "reversed": list(range(n, 0, -1)),
+        "organ pipe": list(range(n // 2)) + list(range(n // 2, 0, -1)),
+        "small": [rng.randrange(10) for _ in range(20)],
+        "empty": [],
+    }
+
+
+@pytest.mark.parametrize("name", list(patterns()))
+def test_pdq_sort_matches_intro_sort_steps(name):
+    assert_consistent(patterns()[name])
+
+
+@pytest.mark.parametrize("name", list(patterns()))
+def test_heap_fallback_matches(monkeypatch, name):
+    # 最初の偏った分割でヒープソートに切り替わるようにする
+    monkeypatch.setattr(introSort, "log2_floor", lambda n: 1)
+    assert_consistent(patterns(seed=1)[name])
+
+
+def test_pdq_sort_key_and_reverse():
+    items = [(random.randrange(5), i) for i in range(1000)]
+    expected = sorted(items, key=lambda p: p[0], reverse=True)
+    assert pdq_sort(list(items), key=lambda p: p[0], reverse=True) == expected
@@ -0,0 +1,28 @@
+import random
+
+from mergeSort import PARALLEL_THRESHOLD, merge_sort_buffered, parallel_merge_sort
+
+
+def test_parallel_merge_sort_shared_memory_path():
+    rng = random.Random(5)
+    data = [rng.randrange(-10**12, 10**12) for _ in range(PARALLEL_THRESHOLD + 1000)]
+    assert parallel_merge_sort(data, workers=3) == sorted(data)
+    floats = [rng.random() for _ in range(PARALLEL_THRESHOLD)]
+    assert parallel_merge_sort(floats, workers=2) == sorted(floats)
+
+
+def test_parallel_merge_sort_keeps_mixed_types():
+    data = [1, 2.5] * (PARALLEL_THRESHOLD // 2 + 1)
+    result = parallel_merge_sort(data, workers=2)
+    assert result == sorted(data)
+    assert [type(x) for x in result] == [type(x) for x in sorted(data)]
+
+
+def test_parallel_merge_sort_handles_ints_beyond_int64():
+    data = [2**64] + list(range(PARALLEL_THRESHOLD + 10, 0, -1))
+    assert parallel_merge_sort(data, workers=2) == sorted(data)
+
+
+def test_merge_sort_buffered_is_stable():
+    pairs = [(random.randrange(5), i) for i in range(500)]
+    assert merge_sort_buffered(list(pairs), key=lambda p: p[0]) == sorted(pairs, key=lambda p: p[0])
@@ -0,0 +1,30 @@
+import pytest
+
+
+@pytest.fixture
+def mmap_search(load_search):
+    return load_search("mmap-binary-search")
+
+
+@pytest.fixture
+def path(tmp_path, mmap_search):
+    path = str(tmp_path / "index.bin")
+    mmap_search.write_records(path, ((key, key * 100) for key in range(0, 30000, 3)))
+    return path
+
+
+def test_lookup_and_scan(mmap_search, path):
+    with mmap_search.RecordFile(path) as records:
+        assert records.lookup(300) == (300, 30000)
+        assert records.lookup(301) is None
+        assert list(records.scan(300, 312)) == [(300, 30000), (303, 30300), (306, 30600), (309, 30900)]
+
+
+def test_close_while_a_scan_is_paused(mmap_search, path):
+    records = mmap_search.RecordFile(path)
+    scan = records.scan(0, 30000)
+    assert next(scan) == (0, 0)
+    records.close()
+    assert records._file.closed
+    with pytest.raises(ValueError):
+        list(scan)
@@ -0,0 +1,88 @@
+import math
+import random
+
+import pytest
+
+import quickSort
+from quickSort import quick_sort, quick_sort_inplace
+
+
+class Adversary:
+    """McIlroy の antiquicksort: 比較のたびに値を決めて、ピボットがいつも偏るようにする"""
+
+    def __init__(self, n):
+        self.gas = n
+        self.values = [n] * n
+        self.solid = 0
+        self.candidate = None
+        self.comparisons = 0
+
+    def compare(self, x, y):
+        self.comparisons += 1
+        values = self.values
+        if values[x] == self.gas and values[y] == self.gas:
+            frozen = x if x == self.candidate else y
+            values[frozen] = self.solid
+            self.solid += 1
+        if values[x] == self.gas:
+            self.candidate = x
+        elif values[y] == self.gas:
+            self.candidate = y
+        return values[x] - values[y]
+
+
+class Probe:
+    __slots__ = ("index", "adversary")
+
+    def __init__(self, index, adversary):
+        self.index = index
+        self.adversary = adversary
+
+    def __lt__(self, other):
+        return self.adversary.compare(self.index, other.index) < 0
+
+    def __gt__(self, other):
+        return self.adversary.compare(self.index, other.index) > 0
+
+    def __eq__(self, other):
+        return self.adversary.compare(self.index, other.index) == 0
+
+
+def adversarial_comparisons(n):
+    adversary = Adversary(n)
+    quick_sort_inplace([Probe(i, adversary) for i in range(n)])
+    return adversary.comparisons
+
+
+def test_depth_budget_keeps_adversarial_input_n_log_n():
+    n = 4000
+    assert adversarial_comparisons(n) < 4 * n * math.log2(n)
+
+
+def test_adversary_is_quadratic_without_the_budget(monkeypatch):
+    monkeypatch.setattr(quickSort, "DEPTH_FACTOR", 10**9)
+    n = 4000
+    assert adversarial_comparisons(n) > 10 * n * math.log2(n)
+
+
+def test_quick_sort_returns_a_new_list():
+    data = [5, 3, 8, 1, 9, 2] * 20
+    original = list(data)
+    result = quick_sort(data)
+    assert result == sorted(original)
+    assert data == original
+    assert result is not data
+
+
+@pytest.mark.parametrize("distinct", [2, 3, 50, 10**6])
+def test_quick_sort_inplace_duplicates(distinct):
+    rng = random.Random(distinct)
+    data = [rng.randrange(distinct) for _ in range(3000)]
+    arr = list(data)
+    assert quick_sort_inplace(arr) is arr
+    assert arr == sorted(data)
+
+
+def test_quick_sort_key_and_reverse():
+    items = [(random.randrange(5), i) for i in range(500)]
+    assert quick_sort(items, key=lambda p: p[0], reverse=True) == sorted(items, key=lambda p: p[0], reverse=True)
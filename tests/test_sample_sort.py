@@ -0,0 +1,31 @@
+import random
+
+from sampleSort import PARALLEL_THRESHOLD, parallel_sample_sort, sample_sort_order
+
+
+def stable_order(keys):
+    return sorted(range(len(keys)), key=lambda i: keys[i])
+
+
+def test_sample_sort_order_ints_and_floats():
+    rng = random.Random(3)
+    keys = [rng.randrange(1000) for _ in range(PARALLEL_THRESHOLD + 500)]
+    assert sample_sort_order(keys, workers=3) == stable_order(keys)
+    mixed = [rng.choice([rng.randrange(100), rng.random() * 100]) for _ in range(PARALLEL_THRESHOLD)]
+    assert sample_sort_order(mixed, workers=2) == stable_order(mixed)
+
+
+def test_sample_sort_order_large_ints_mixed_with_floats():
+    keys = [2**60 + i for i in range(PARALLEL_THRESHOLD, 0, -1)] + [0.5]
+    assert sample_sort_order(keys, workers=2) == stable_order(keys)
+
+
+def test_sample_sort_order_ints_beyond_int64():
+    keys = [2**70 - i for i in range(PARALLEL_THRESHOLD)]
+    assert sample_sort_order(keys, workers=2) == stable_order(keys)
+
+
+def test_parallel_sample_sort_reverse_is_stable():
+    items = [(random.randrange(10), i) for i in range(2000)]
+    expected = sorted(items, key=lambda p: p[0], reverse=True)
+    assert parallel_sample_sort(items, workers=2, key=lambda p: p[0], reverse=True) == expected
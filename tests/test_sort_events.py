@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+from bucketSort import bucket_sort_steps
+from countingSort import counting_sort_steps
+from radixSort import radix_sort_steps
+from sortEvents import COMPARE, READ, FrameAdapter, run_turbo
+from sortScheduler import FrameScheduler
+
+
+@pytest.mark.parametrize("steps_fn", [bucket_sort_steps, counting_sort_steps, radix_sort_steps])
+def test_single_element_reads_are_not_comparisons(steps_fn):
+    rng = random.Random(3)
+    data = [rng.randrange(1000) for _ in range(200)]
+    events = list(steps_fn(data))
+    assert not [e for e in events if e[0] == COMPARE and e[1] == e[2]]
+    assert any(op == READ for op, _, _ in events)
+    assert data == sorted(data)
+
+
+def test_run_turbo_counts_reads_separately():
+    report = run_turbo(counting_sort_steps([3, 1, 2]))
+    assert report["compare"] == 0
+    assert report["read"] > 0
+    assert report["steps"] == sum(report[name] for name in ("compare", "swap", "write", "mark_sorted", "read"))
+
+
+def test_frame_adapter_highlights():
+    adapter = FrameAdapter([5, 6, 7])
+    adapter.apply(READ, 1, 1)
+    assert adapter.comparing == [1]
+    adapter.apply(COMPARE, 2, 2)
+    assert adapter.comparing == [2, 2]
+
+
+def test_scheduler_highlights_reads():
+    scheduler = FrameScheduler(iter([(READ, 2, 2), (COMPARE, 0, 1)]), [1, 2, 3])
+    assert scheduler.advance(1).comparing == [2]
+    assert scheduler.advance(1).comparing == [0, 1]
@@ -0,0 +1,40 @@
+from sortInstrument import instrument
+
+
+def swap_first_two(arr):
+    arr[0], arr[1] = arr[1], arr[0]
+
+
+def write_constants(arr):
+    # 値は入れ替わるが、どちらも配列から読んだ値ではないので交換ではない
+    arr[0] = 2
+    arr[1] = 1
+
+
+def copy_then_write(arr):
+    arr[0] = arr[1]
+    arr[1] = 1
+
+
+def test_swap_of_small_ints_is_one_swap():
+    report = instrument(swap_first_two, [1, 2], wrap_elements=False, track_depth=False)
+    assert (report["swaps"], report["writes"]) == (1, 0)
+    assert report["result"] == [2, 1]
+
+
+def test_writes_of_shared_small_ints_are_not_swaps():
+    report = instrument(write_constants, [1, 2], wrap_elements=False, track_depth=False)
+    assert (report["swaps"], report["writes"]) == (0, 2)
+
+
+def test_write_after_a_read_is_not_half_a_swap():
+    report = instrument(copy_then_write, [1, 2], wrap_elements=False, track_depth=False)
+    assert (report["swaps"], report["writes"]) == (0, 2)
+
+
+def test_negative_indices_pair_up():
+    def swap_ends(arr):
+        arr[0], arr[-1] = arr[-1], arr[0]
+
+    report = instrument(swap_ends, [1, 5, 9], wrap_elements=False, track_depth=False)
+    assert (report["swaps"], report["writes"]) == (1, 0)
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+import sortKeys
+from heapSort import heap_sort
+from radixSort import radix_sort_array
+from sortKeys import sort_by_key, with_key
+
+
+class Record:
+    def __init__(self, a, b):
+        self.a = a
+        self.b = b
+
+
+def records(n=200, seed=0):
+    rng = random.Random(seed)
+    return [Record(rng.randrange(5), i) for i in range(n)]
+
+
+def test_sort_by_key_always_runs_the_given_sort():
+    calls = []
+
+    def sort_fn(arr):
+        calls.append(len(arr))
+        arr.sort()
+
+    items = records()
+    result = sort_by_key(sort_fn, items, key=lambda r: (r.a,))
+    assert calls == [len(items)]
+    assert [r.b for r in result] == [r.b for r in sorted(items, key=lambda r: r.a)]
+
+
+def test_radix_shortcut_is_opt_in():
+    items = records()
+
+    def never(arr):
+        raise AssertionError("radix=True must not call the sort")
+
+    result = sort_by_key(never, items, key=lambda r: r.a, reverse=True, radix=True)
+    assert result == sorted(items, key=lambda r: r.a, reverse=True)
+    with pytest.raises(TypeError):
+        sort_by_key(never, items, key=lambda r: str(r.a), radix=True)
+
+
+@pytest.mark.parametrize("name", ["bubble_sort", "selection_sort", "insertion_sort"])
+def test_keyed_display_sorts(name):
+    sort = getattr(sortKeys, name)
+    items = records(60)
+    for reverse in (False, True):
+        expected = sorted(items, key=lambda r: r.a, reverse=reverse)
+        assert sort(list(items), key=lambda r: r.a, reverse=reverse) == expected
+    assert sort([3, 1, 2]) == [1, 2, 3]
+
+
+def test_with_key_on_other_sorts():
+    items = records()
+    assert with_key(heap_sort)(list(items), key=lambda r: r.a) == sorted(items, key=lambda r: r.a)
+
+
+def test_radix_sort_array_key_and_reverse_are_stable():
+    items = records()
+    assert radix_sort_array(items, key=lambda r: r.a) == sorted(items, key=lambda r: r.a)
+    assert radix_sort_array(items, key=lambda r: r.a, reverse=True) == sorted(items, key=lambda r: r.a, reverse=True)
+    assert radix_sort_array([3, -1.5, 2], reverse=True) == [3, 2, -1.5]
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from bucketSort import bucket_sort_steps
+from introSort import intro_sort_steps
+from sortEvents import SWAP, WRITE, FrameAdapter
+from sortTrace import TracePlayer, TraceRecorder, record_trace
+from timSort import tim_sort_steps
+
+
+def replay_frames(steps_fn, data):
+    adapter = FrameAdapter(data)
+    frames = []
+    for event in steps_fn(list(data)):
+        adapter.apply(*event)
+        frames.append(adapter.frame())
+    return frames
+
+
+@pytest.mark.parametrize("steps_fn", [tim_sort_steps, intro_sort_steps, bucket_sort_steps])
+@pytest.mark.parametrize("floats", [False, True])
+def test_trace_replays_every_frame(tmp_path, steps_fn, floats):
+    rng = random.Random(7)
+    data = [rng.random() * 100 if floats else rng.randrange(100) for _ in range(150)]
+    frames = replay_frames(steps_fn, data)
+    path = str(tmp_path / "trace.bin")
+    array = list(data)
+    count = record_trace(steps_fn(array), array, path, keyframe_interval=11)
+    with TracePlayer(path) as player:
+        assert player.typecode == ("d" if floats else "q")
+        assert len(player) == count == len(frames)
+        assert player.frame(0) == data
+        for step in range(1, count + 1):
+            assert player.frame(step) == frames[step - 1]
+        assert player.frame(count) == sorted(data)
+
+
+def test_trace_events_return_written_values(tmp_path):
+    recorder = TraceRecorder([0.5, 1.5], keyframe_interval=2)
+    recorder.record(WRITE, 0, 2.25)
+    recorder.record(SWAP, 0, 1)
+    path = str(tmp_path / "trace.bin")
+    recorder.save(path)
+    with TracePlayer(path) as player:
+        assert player.event(0) == (WRITE, 0, 2.25)
+        assert player.event(1) == (SWAP, 0, 1)
+        assert player.frame(2) == [1.5, 2.25]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        TracePlayer(str(path))